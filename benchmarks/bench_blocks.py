@@ -0,0 +1,33 @@
+"""
+Benchmark showing how markdown_to_blocks scales with the number of blocks.
+Run from the repository root with :
+    python -m benchmarks.bench_blocks
+"""
+
+import timeit
+
+from benchmarks.corpus import long_paragraphs
+from src.converter import markdown_to_blocks
+
+SIZES = (1_000, 2_000, 4_000, 8_000, 16_000)
+
+
+def main():
+    """
+    Time markdown_to_blocks for each size and print the time per block.
+    A linear implementation keeps the time per block roughly constant.
+    """
+    print(f"{'blocks':>8} {'total (ms)':>12} {'per block (us)':>16}")
+    for size in SIZES:
+        document = long_paragraphs(size, sentences=1)
+        runs = 5
+        total = min(
+            timeit.repeat(
+                lambda d=document: markdown_to_blocks(d), number=1, repeat=runs
+            )
+        )
+        print(f"{size:>8} {total * 1e3:>12.2f} {total / size * 1e6:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark of the interned style sets against freshly built sets.
+Run from the repository root with :
+    python -m benchmarks.bench_styles
+"""
+
+import timeit
+import tracemalloc
+
+from benchmarks.corpus import long_paragraph
+from src.markdownnode import MarkdownNodes
+from src.textnode import NORMAL_STYLES, TextNode, TextType, add_style
+
+NODE_COUNT = 100_000
+
+
+def legacy_apply_style(current_styles, new_style):
+    """
+    Style combination as done before interning: copy then add
+    """
+    between_styles = current_styles.copy() if current_styles else set()
+    between_styles.add(new_style)
+    return between_styles
+
+
+def allocated_bytes(function):
+    """
+    Return the peak memory traced while calling function
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """
+    Print the time and memory of each operation, fresh sets first
+    """
+    node = TextNode("text", NORMAL_STYLES)
+    bold = {TextType.BOLD}
+    interned_bold = add_style(frozenset(), TextType.BOLD)
+    operations = (
+        (
+            "normal check",
+            lambda: node.styles != {TextType.NORMAL},
+            lambda: node.styles is not NORMAL_STYLES,
+        ),
+        (
+            "add style",
+            lambda: legacy_apply_style(bold, TextType.ITALIC),
+            lambda: add_style(interned_bold, TextType.ITALIC),
+        ),
+    )
+
+    print(f"{'operation':<16} {'fresh set (ns)':>16} {'interned (ns)':>16}")
+    for name, fresh, interned in operations:
+        fresh_time = min(timeit.repeat(fresh, number=NODE_COUNT, repeat=5))
+        interned_time = min(
+            timeit.repeat(interned, number=NODE_COUNT, repeat=5))
+        print(
+            f"{name:<16} {fresh_time / NODE_COUNT * 1e9:>16.1f}"
+            f" {interned_time / NODE_COUNT * 1e9:>16.1f}"
+        )
+
+    fresh_bytes = allocated_bytes(
+        lambda: [legacy_apply_style(bold, TextType.ITALIC)
+                 for _ in range(NODE_COUNT)]
+    )
+    interned_bytes = allocated_bytes(
+        lambda: [add_style(interned_bold, TextType.ITALIC)
+                 for _ in range(NODE_COUNT)]
+    )
+    print(
+        f"\n{NODE_COUNT} styles kept: "
+        f"{fresh_bytes / 1e6:.1f} MB with fresh sets,"
+        f" {interned_bytes / 1e6:.1f} MB with interned sets"
+    )
+
+    paragraph = long_paragraph(300)
+    parse_time = min(
+        timeit.repeat(lambda: MarkdownNodes.text_to_textnodes(paragraph),
+                      number=10, repeat=5)
+    )
+    print(
+        "text_to_textnodes on a 300 sentence paragraph: "
+        f"{parse_time / 10 * 1e3:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Synthetic markdown corpora used by the benchmarks.
+Every generator is deterministic so results can be compared between commits.
+"""
+
+import os
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog while hobbits walk "
+    "through misty mountains towards lonely peaks and elven halls"
+).split()
+
+
+def sentence(index, length=12):
+    """
+    Return a plain sentence of length words, different for each index
+    """
+    words = [WORDS[(index * 7 + i * 3) % len(WORDS)] for i in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def long_paragraphs(count, sentences=8):
+    """
+    Return a document of count paragraphs with a little inline markup
+    """
+    paragraphs = ["# Long paragraphs"]
+    for i in range(count):
+        text = " ".join(sentence(i + j) for j in range(sentences))
+        paragraphs.append(f"{text} Some **bold** and *italic* and `code`.")
+    return "\n\n".join(paragraphs)
+
+
+def long_paragraph(sentences):
+    """
+    Return a single prose paragraph with emphasis every few sentences
+    """
+    parts = []
+    for i in range(sentences):
+        part = sentence(i)
+        if i % 3 == 0:
+            part = f"**{part}**"
+        elif i % 3 == 1:
+            part = f"_{part}_"
+        parts.append(part)
+    return " ".join(parts)
+
+
+def deep_emphasis(count):
+    """
+    Return a paragraph of count runs of emphasis nested four levels deep
+    """
+    nested = "*italic **bold _inner __deepest__ inner_ bold** italic*"
+    return " then ".join(nested for _ in range(count))
+
+
+def link_heavy(count):
+    """
+    Return a paragraph made of count links and images, like a tag cloud
+    """
+    items = []
+    for i in range(count):
+        if i % 10 == 0:
+            items.append(f"![image {i}](/images/{i}.png)")
+        else:
+            items.append(f"[tag {i}](/tags/{i})")
+    return " | ".join(items)
+
+
+def large_list(count):
+    """
+    Return a document with an unordered and an ordered list of count items
+    """
+    unordered = "\n".join(
+        f"- item {i} with [a link](/items/{i})" for i in range(count)
+    )
+    ordered = "\n".join(
+        f"{i}. step {i} is **important**" for i in range(1, 10))
+    return f"# Lists\n\n{unordered}\n\n{ordered}"
+
+
+def repeated_blocks(count):
+    """
+    Return a documentation page made of count sections sharing
+    the same navigation list, disclaimer and heading
+    """
+    navigation = (
+        "- [Back to top](#top)\n- [Index](/index.html)\n"
+        "- Edit this page on **GitHub**"
+    )
+    disclaimer = (
+        "> **Note:** this documentation is provided _as is_, "
+        "see the [license](/license.html) for details."
+    )
+    sections = [
+        f"## See also\n\n{navigation}\n\n{sentence(i)}\n\n{disclaimer}"
+        for i in range(count)
+    ]
+    return "# Documentation\n\n" + "\n\n".join(sections)
+
+
+def write_many_small_files(content_dir, count):
+    """
+    Write count small pages in a single directory
+    """
+    os.makedirs(content_dir, exist_ok=True)
+    for i in range(count):
+        path = os.path.join(content_dir, f"page{i}.md")
+        with open(path, "w", encoding="UTF-8") as f:
+            f.write(f"# Page {i}\n\n{sentence(i)} See [home](/).")
+
+
+def write_deep_tree(content_dir, depth, breadth):
+    """
+    Write a directory tree depth levels deep with breadth subdirectories
+    per level, each directory holding one page
+    """
+
+    def write_tree(directory, level):
+        os.makedirs(directory, exist_ok=True)
+        with open(
+            os.path.join(directory, "index.md"), "w", encoding="UTF-8"
+        ) as f:
+            f.write(f"# Level {level}\n\n{long_paragraph(4)}")
+        if level < depth:
+            for i in range(breadth):
+                write_tree(os.path.join(directory, f"section{i}"), level + 1)
+
+    write_tree(content_dir, 0)
+
+
+def write_static_files(static_dir, count, size):
+    """
+    Write count static files of size bytes, spread over ten directories
+    """
+    data = os.urandom(size)
+    for i in range(count):
+        directory = os.path.join(static_dir, f"images{i % 10}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"image{i}.png"), "wb") as f:
+            f.write(data)
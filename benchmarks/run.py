@@ -0,0 +1,264 @@
+"""
+Benchmark suite for the converter and generator hot paths.
+Run from the repository root with :
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare results.json
+
+Results are written as JSON. With --compare, each benchmark is compared
+to a previous result file and the run fails if one is slower than the
+allowed threshold.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from benchmarks import corpus
+from src.converter import (
+    INLINE_PARSERS,
+    configure,
+    markdown_to_blocks,
+    markdown_to_html_node,
+)
+from src.generator import generate_pages_recursive, sync_static
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+def _inline_benchmark(text, inline_parser, validate=True):
+    """
+    Return a function parsing text with the given inline parser
+    """
+    parser = INLINE_PARSERS[inline_parser]
+    return lambda: parser.text_to_textnodes(text, validate)
+
+
+def _block_cache_benchmark(text, block_cache_size):
+    """
+    Return a (function, cleanup) tuple converting text with a block cache
+    of block_cache_size, emptied before each call
+    """
+    previous = configure(block_cache_size=block_cache_size)
+
+    def convert():
+        configure(block_cache_size=block_cache_size)
+        markdown_to_html_node(text).to_html()
+
+    return convert, lambda: configure(**previous)
+
+
+def _generator_benchmark(write_content):
+    """
+    Return a (function, cleanup) tuple building the site written by
+    write_content(content_dir) from scratch at each call
+    """
+    root = tempfile.mkdtemp(prefix="ssg-bench-")
+    content_dir = os.path.join(root, "content")
+    template_path = os.path.join(root, "template.html")
+    write_content(content_dir)
+    with open(template_path, "w", encoding="UTF-8") as f:
+        f.write(TEMPLATE)
+
+    def build():
+        output_dir = os.path.join(root, "docs")
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(content_dir, template_path, output_dir)
+
+    return build, lambda: shutil.rmtree(root)
+
+
+def _static_benchmark(full_copy):
+    """
+    Return a (function, cleanup) tuple syncing a static directory,
+    to an empty directory at each call if full_copy is True
+    """
+    root = tempfile.mkdtemp(prefix="ssg-bench-")
+    static_dir = os.path.join(root, "static")
+    dest_dir = os.path.join(root, "docs")
+    corpus.write_static_files(static_dir, 500, 64 * 1024)
+    sync_static(static_dir, dest_dir)
+
+    def sync():
+        if full_copy:
+            shutil.rmtree(dest_dir)
+        sync_static(static_dir, dest_dir)
+
+    return sync, lambda: shutil.rmtree(root)
+
+
+def benchmark_cases():
+    """
+    Return a dictionnary mapping each benchmark name to a function
+    returning a (function to time, cleanup function or None) tuple
+    """
+    paragraphs = corpus.long_paragraphs(2000)
+    prose = corpus.long_paragraph(300)
+    emphasis = corpus.deep_emphasis(200)
+    links = corpus.link_heavy(1000)
+    large_list = corpus.large_list(2000)
+    repeated = corpus.repeated_blocks(500)
+
+    cases = {
+        "blocks/long_paragraphs": lambda: (
+            lambda: markdown_to_blocks(paragraphs), None),
+        "html/long_paragraphs": lambda: (
+            lambda: markdown_to_html_node(paragraphs).to_html(), None),
+        "html/large_list": lambda: (
+            lambda: markdown_to_html_node(large_list).to_html(), None),
+        "html/link_heavy": lambda: (
+            lambda: markdown_to_html_node(links).to_html(), None),
+        "html/repeated_blocks": lambda: (
+            lambda: markdown_to_html_node(repeated).to_html(), None),
+        "html/repeated_blocks_cached": lambda: _block_cache_benchmark(
+            repeated, 256),
+        "generator/many_small_files": lambda: _generator_benchmark(
+            lambda content_dir: corpus.write_many_small_files(content_dir, 300)
+        ),
+        "generator/deep_tree": lambda: _generator_benchmark(
+            lambda content_dir: corpus.write_deep_tree(content_dir, 5, 3)
+        ),
+        "static/full_copy": lambda: _static_benchmark(True),
+        "static/no_change": lambda: _static_benchmark(False),
+    }
+    for inline_parser in sorted(INLINE_PARSERS):
+        for name, text in (
+            ("long_paragraph", prose),
+            ("deep_emphasis", emphasis),
+            ("link_heavy", links),
+        ):
+            cases[f"inline/{inline_parser}/{name}"] = (
+                lambda text=text, inline_parser=inline_parser: (
+                    _inline_benchmark(text, inline_parser), None)
+            )
+            # Same parse with the node validation skipped, see --fast
+            cases[f"inline/{inline_parser}-fast/{name}"] = (
+                lambda text=text, inline_parser=inline_parser: (
+                    _inline_benchmark(text, inline_parser, False), None)
+            )
+    return cases
+
+
+def run_case(setup, repeat):
+    """
+    Time a benchmark and return its result dictionnary
+    """
+    function, cleanup = setup()
+    try:
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        runs = [
+            total / number
+            for total in timer.repeat(repeat=repeat, number=number)
+        ]
+    finally:
+        if cleanup is not None:
+            cleanup()
+    return {
+        "min": min(runs),
+        "mean": sum(runs) / len(runs),
+        "runs": runs,
+        "loops": number,
+    }
+
+
+def _git_revision():
+    """
+    Return the current git commit, or None outside of a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the ratio of each benchmark to the baseline and return the
+    names of the benchmarks slower than 1 + threshold
+    """
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            print(f"{name:<40} {'new':>10}")
+            continue
+        ratio = result["min"] / previous["min"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {ratio:>9.2f}x{flag}")
+    return regressions
+
+
+def main():
+    """
+    Parse arguments, run the selected benchmarks and report results
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "-o", "--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help=(
+            "allowed slowdown before failing a comparison "
+            "(default 0.1 = 10%%)"
+        ),
+    )
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of timing runs")
+    parser.add_argument(
+        "-k", "--filter", default="",
+        help="only run benchmarks containing this",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "metadata": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "revision": _git_revision(),
+        },
+        "benchmarks": {},
+    }
+    for name, setup in benchmark_cases().items():
+        if args.filter not in name:
+            continue
+        result = run_case(setup, args.repeat)
+        results["benchmarks"][name] = result
+        print(f"{name:<40} {result['min'] * 1e3:>10.3f} ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, "r", encoding="UTF-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,4 @@
-python3 src/main.py
+python3 src/main.py --watch &
+WATCH_PID=$!
+trap 'kill $WATCH_PID' EXIT
 cd docs && python3 -m http.server 8888
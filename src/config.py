@@ -15,3 +15,19 @@ STATIC_DIR = os.path.join(BASE_DIR, "..", "static")
 TEMPLATE_FILE = os.path.join(TEMPLATE_FILE, "template.html")
 INDEX_MARKDOWN = os.path.join(CONTENT_DIR, "index.md")
 INDEX_HTML = os.path.join(DOCS_DIR, "index.html")
+
+# Incremental build manifest, stored next to docs/
+MANIFEST_FILE = os.path.join(BASE_DIR, "..", ".build-manifest.json")
+
+# Cache of converted pages shared by builds, and its maximum size in bytes
+CACHE_DIR = os.path.join(BASE_DIR, "..", ".cache")
+PAGE_CACHE_SIZE = 64 * 1024 * 1024
+
+# Threads writing output files while the next pages are converted
+WRITER_THREADS = 4
+
+# Threads copying static files
+COPY_THREADS = 8
+
+# Blocks kept in memory by the watch mode when no block cache size is given
+WATCH_BLOCK_CACHE_SIZE = 4096
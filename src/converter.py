@@ -4,12 +4,15 @@ and some associated helper functions
 """
 
 import re
+import time
 from enum import Enum
+from functools import lru_cache
 
+from src.inlinescanner import InlineScanner
 from src.leafnode import LeafNode
 from src.markdownnode import MarkdownNodes
 from src.parentnode import ParentNode
-from src.textnode import TextNode, TextType
+from src.textnode import PRIMARY_STYLES, TextNode, TextType
 
 
 class BlockType(Enum):
@@ -25,12 +28,91 @@ class BlockType(Enum):
     PARAGRAPH = "paragraph"
 
 
+# Inline parsers that can be selected with configure(inline_parser=...)
+INLINE_PARSERS = {"pipeline": MarkdownNodes, "scanner": InlineScanner}
+
+# Conversion settings of the current process, see configure
+_settings = {
+    "inline_parser": "pipeline",
+    "validate_textnodes": True,
+    "block_cache_size": 0,
+}
+# Objects selected by the settings of the current process, and the
+# BuildProfile recording the conversion stages, see set_profile
+_state = {"inline_parser": MarkdownNodes, "profile": None}
+
+
+def configure(**settings):
+    """
+    Change the conversion settings of the current process
+    and return the previous ones, so they can be restored.
+    - inline_parser is "pipeline" for MarkdownNodes or "scanner"
+    for the single-pass InlineScanner, both give the same TextNode
+    - validate_textnodes False skips the checks of the nodes built by
+    the inline parser itself, only the urls found in the text are checked
+    - block_cache_size is the number of converted blocks kept in memory
+    so repeated blocks are converted once, 0 disables the cache.
+    The cache is emptied each time the settings change.
+    """
+    global _block_converter  # pylint: disable=global-statement
+
+    previous = get_settings()
+    for name, value in settings.items():
+        if name not in _settings:
+            raise ValueError(f"Unknown conversion setting: {name}")
+        if name == "inline_parser" and value not in INLINE_PARSERS:
+            raise ValueError(f"Unknown inline parser: {value}")
+        if name == "block_cache_size" and (
+            not isinstance(value, int) or value < 0
+        ):
+            raise ValueError(f"Invalid block cache size: {value}")
+        _settings[name] = value
+
+    _state["inline_parser"] = INLINE_PARSERS[_settings["inline_parser"]]
+    if _settings["block_cache_size"]:
+        _block_converter = lru_cache(maxsize=_settings["block_cache_size"])(
+            _block_to_html_node
+        )
+    else:
+        _block_converter = _block_to_html_node
+    return previous
+
+
+def set_profile(profile):
+    """
+    Record the time spent splitting blocks and parsing inline text in
+    a BuildProfile, or stop recording with None.
+    Return the previous profile. Worker processes do not record.
+    """
+    previous = _state["profile"]
+    _state["profile"] = profile
+    return previous
+
+
+def get_settings():
+    """
+    Return a copy of the conversion settings of the current process
+    """
+    return dict(_settings)
+
+
+def block_cache_info():
+    """
+    Return the hits, misses, maxsize and currsize of the block cache
+    of the current process, or None when it is disabled
+    """
+    if _block_converter is _block_to_html_node:
+        return None
+    return _block_converter.cache_info()
+
+
 def text_node_to_html(text_node: TextNode):
     """
     Convert a TextNode in HTMLNode
     """
-    # Get style_type from the set
-    style = next(iter(text_node.styles))
+    # Get style_type from the interned set
+    style = (PRIMARY_STYLES.get(text_node.styles)
+             or next(iter(text_node.styles)))
 
     match style:
         case TextType.NORMAL:
@@ -52,24 +134,39 @@ def text_node_to_html(text_node: TextNode):
             )
 
 
-def markdown_to_blocks(markdown_text):
+def iter_markdown_blocks(markdown_text):
     """
-    Create MarkDown blocks from a MarkDown text, return a list of blocks
+    Yield a (line_number, block) tuple for each block of a MarkDown text.
+    Blocks are separated by a blank line, stripped, and whitespace-only
+    blocks are skipped. line_number is the 1-based line of the source
+    where the stripped block starts.
+    The text is scanned once, so the cost is linear in its size.
     """
-    # Base case
-    if not markdown_text:
-        return []
+    start = 0
+    line_number = 1
+    length = len(markdown_text)
 
-    split = markdown_text.split("\n\n")
+    while start <= length:
+        end = markdown_text.find("\n\n", start)
+        if end == -1:
+            end = length
 
-    # Filter out empty or whitespace-only blocks
-    split_filtered = list(filter(lambda x: x.strip(), split))
+        chunk = markdown_text[start:end]
+        block = chunk.strip()
+        if block:
+            leading = len(chunk) - len(chunk.lstrip())
+            yield line_number + chunk.count("\n", 0, leading), block
 
-    # After filtering, we use recursive call
-    ret = split_filtered[0].strip()
-    remaining = "\n\n".join(split_filtered[1:])
+        # Skip the chunk and the blank line separating it from the next one
+        line_number += chunk.count("\n") + 2
+        start = end + 2
 
-    return [ret] + markdown_to_blocks(remaining)
+
+def markdown_to_blocks(markdown_text):
+    """
+    Create MarkDown blocks from a MarkDown text, return a list of blocks
+    """
+    return [block for _, block in iter_markdown_blocks(markdown_text)]
 
 
 def block_to_block_type(block):
@@ -105,83 +202,134 @@ def block_to_block_type(block):
     return BlockType.PARAGRAPH
 
 
-def markdown_to_html_node(markdown_text):
+def _text_to_children(text):
+    """
+    Convert inline MarkDown text into a list of HTMLNode
+    """
+    profile = _state["profile"]
+    if profile is not None:
+        start = time.perf_counter()
+    text_nodes = _state["inline_parser"].text_to_textnodes(
+        text, _settings["validate_textnodes"])
+    children = [text_node_to_html(node) for node in text_nodes]
+    if profile is not None:
+        profile.add("inline", time.perf_counter() - start)
+    return children
+
+
+def _heading_to_html_node(block):
     """
-    Convert a MD formatted text into HTML Nodes
+    Convert a heading block into a <h1> to <h6> node
     """
+    return ParentNode(
+        tag=f"h{block.count('#')}",
+        children=_text_to_children(block.lstrip("#").lstrip()),
+    )
 
-    blocks = markdown_to_blocks(markdown_text)
 
-    # Base case
-    if not blocks:
-        return ParentNode(tag="div", children=[])
+def _code_to_html_node(block):
+    """
+    Convert a code block into a <pre><code> node
+    """
+    code_node = ParentNode(
+        tag="code",
+        children=_text_to_children(block.lstrip("```").rstrip("```").strip()),
+    )
+    return ParentNode(tag="pre", children=[code_node])
 
-    block_type = block_to_block_type(blocks[0])
-    all_nodes = []
 
-    # Heading case
-    if block_type == BlockType.HEADING:
-        text_nodes = MarkdownNodes.text_to_textnodes(
-            blocks[0].lstrip("#").lstrip())
-        html_nodes = [text_node_to_html(node) for node in text_nodes]
-        all_nodes.append(
-            ParentNode(
-                tag=f"h{blocks[0].count('#')}",
-                children=html_nodes,
-            )
-        )
+def _quote_to_html_node(block):
+    """
+    Convert a quote block into a <blockquote> node
+    """
+    return ParentNode(
+        tag="blockquote",
+        children=_text_to_children(block.lstrip(">").lstrip()),
+    )
+
+
+def _unordered_list_to_html_node(block):
+    """
+    Convert an unordered list block into a <ul> node
+    """
+    li_nodes = [
+        ParentNode(tag="li", children=_text_to_children(
+            item.lstrip("- ").lstrip("* ")))
+        for item in block.split("\n")
+    ]
+    return ParentNode(tag="ul", children=li_nodes)
+
+
+def _ordered_list_to_html_node(block):
+    """
+    Convert an ordered list block into a <ol> node
+    """
+    li_nodes = [
+        ParentNode(tag="li", children=_text_to_children(
+            re.sub(r"^\d\.\s+", "", item)))
+        for item in block.split("\n")
+    ]
+    return ParentNode(tag="ol", children=li_nodes)
 
-    # Code case
-    elif block_type == BlockType.CODE:
-        text_nodes = MarkdownNodes.text_to_textnodes(
-            blocks[0].lstrip("```").rstrip("```").strip()
-        )
-        html_nodes = [text_node_to_html(node) for node in text_nodes]
-        code_node = ParentNode(tag="code", children=html_nodes)
-        all_nodes.append(ParentNode(tag="pre", children=[code_node]))
-
-    # Quote case
-    elif block_type == BlockType.QUOTE:
-        text_nodes = MarkdownNodes.text_to_textnodes(
-            blocks[0].lstrip(">").lstrip())
-        html_nodes = [text_node_to_html(node) for node in text_nodes]
-        all_nodes.append(ParentNode(tag="blockquote", children=html_nodes))
-
-    # Unordered list case
-    elif block_type == BlockType.UNORDERED_LIST:
-        li_nodes = []
-        items = blocks[0].split("\n")
-        for item in items:
-            text_nodes = MarkdownNodes.text_to_textnodes(
-                item.lstrip("- ").lstrip("* "))
-            html_nodes = [text_node_to_html(node) for node in text_nodes]
-            li_node = ParentNode(tag="li", children=html_nodes)
-            li_nodes.append(li_node)
-        all_nodes.append(ParentNode(tag="ul", children=li_nodes))
-
-    # Ordered list case
-    elif block_type == BlockType.ORDERED_LIST:
-        li_nodes = []
-        items = blocks[0].split("\n")
-        for item in items:
-            text_nodes = MarkdownNodes.text_to_textnodes(
-                re.sub(r"^\d\.\s+", "", item))
-            html_nodes = [text_node_to_html(node) for node in text_nodes]
-            li_node = ParentNode(tag="li", children=html_nodes)
-            li_nodes.append(li_node)
-        all_nodes.append(ParentNode(tag="ol", children=li_nodes))
-
-    # Paragraph case
-    else:
-        text_nodes = MarkdownNodes.text_to_textnodes(blocks[0])
-        html_nodes = [text_node_to_html(node) for node in text_nodes]
-        all_nodes.append(ParentNode(tag="p", children=html_nodes))
 
-    if len(blocks) > 1:
-        remaining_blocks = "\n\n".join(blocks[1:])
-        next_node = markdown_to_html_node(remaining_blocks)
-        all_nodes = all_nodes + next_node.children
+def _paragraph_to_html_node(block):
+    """
+    Convert a paragraph block into a <p> node
+    """
+    return ParentNode(tag="p", children=_text_to_children(block))
 
+
+# Conversion function for each block type
+BLOCK_TYPE_TO_HTML_NODE = {
+    BlockType.HEADING: _heading_to_html_node,
+    BlockType.CODE: _code_to_html_node,
+    BlockType.QUOTE: _quote_to_html_node,
+    BlockType.UNORDERED_LIST: _unordered_list_to_html_node,
+    BlockType.ORDERED_LIST: _ordered_list_to_html_node,
+    BlockType.PARAGRAPH: _paragraph_to_html_node,
+}
+
+
+def _block_to_html_node(block):
+    """
+    Convert a single MarkDown block into its HTML node
+    """
+    return BLOCK_TYPE_TO_HTML_NODE[block_to_block_type(block)](block)
+
+
+# Block conversion function, wrapped in a LRU cache by configure
+_block_converter = _block_to_html_node
+
+
+def markdown_to_html_node(markdown_text):
+    """
+    Convert a MD formatted text into HTML Nodes.
+    With the block cache enabled, a repeated block gives the same node
+    object in every document, nodes must not be modified after conversion.
+    """
+    if _state["profile"] is not None:
+        return _profiled_markdown_to_html_node(
+            markdown_text, _state["profile"])
+    all_nodes = [
+        _block_converter(block)
+        for _, block in iter_markdown_blocks(markdown_text)
+    ]
+    return ParentNode(tag="div", children=all_nodes)
+
+
+def _profiled_markdown_to_html_node(markdown_text, profile):
+    """
+    markdown_to_html_node recording its time in profile.
+    The time not spent parsing inline text is counted as block splitting.
+    """
+    inline_before = profile.stages["inline"]
+    start = time.perf_counter()
+    all_nodes = [
+        _block_converter(block)
+        for _, block in iter_markdown_blocks(markdown_text)
+    ]
+    elapsed = time.perf_counter() - start
+    profile.add("blocks", elapsed - (profile.stages["inline"] - inline_before))
     return ParentNode(tag="div", children=all_nodes)
 
 
@@ -193,3 +341,31 @@ def extract_title(markdown_text):
         if line.startswith("# ", 0, 2) and not line.startswith("## "):
             return line[2:].strip()
     raise ValueError("No H1 title found")
+
+
+def split_front_matter(markdown_text):
+    """
+    Split an optional front matter block from a MarkDown text.
+    The front matter starts the document with a "---" line, holds one
+    "Key: value" pair per line and ends with another "---" line.
+    Return a (metadata, body) tuple, metadata is empty without front matter.
+    """
+    if not markdown_text.startswith("---\n"):
+        return {}, markdown_text
+
+    # The closing line must be exactly "---", not "----" or "---foo"
+    end = markdown_text.find("\n---", 3)
+    while end != -1 and markdown_text[end + 4: end + 5] not in ("", "\n"):
+        end = markdown_text.find("\n---", end + 4)
+    if end == -1:
+        return {}, markdown_text
+
+    metadata = {}
+    for line in markdown_text[4:end].split("\n"):
+        key, separator, value = line.partition(":")
+        if separator and key.strip():
+            metadata[key.strip()] = value.strip()
+
+    body_start = markdown_text.find("\n", end + 4)
+    body = "" if body_start == -1 else markdown_text[body_start + 1:]
+    return metadata, body
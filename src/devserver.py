@@ -0,0 +1,361 @@
+"""
+This module holds the DevServer class, an asyncio development server
+rendering pages on demand and reloading open browsers on file change
+"""
+
+import asyncio
+import mimetypes
+import os
+from urllib.parse import unquote, urlsplit
+
+from src.generator import BuildContext, _read_file_safely, _render_page
+from src.watcher import Watcher
+
+# Path of the Server-Sent Events stream notifying browsers to reload
+EVENTS_PATH = "/__events"
+
+# Script added to every served page, reloading it on notification
+RELOAD_SCRIPT = (
+    f'<script>new EventSource("{EVENTS_PATH}").onmessage = '
+    "() => location.reload();</script>"
+)
+
+REASONS = {200: "OK", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Error"}
+
+
+class DevServer:
+    """
+    Development server rendering the pages of content_dir on demand.
+    Nothing is built beforehand: a page is converted the first time it is
+    requested and kept in memory until one of its inputs changes, then open
+    browsers are told to reload through SSE.
+    - pages caches the rendered HTML by markdown path
+    - dependencies maps a markdown path to the set of files its page was
+    rendered from, the markdown file and its template
+    - static files are read from static_dir at each request
+
+    Pages are converted in executor threads while invalidations run on the
+    event loop. A page is only kept if no invalidation happened during its
+    conversion, it may have been read before a change.
+    """
+
+    def __init__(self, content_dir, template_file_path, static_dir) -> None:
+        self.content_dir = os.path.abspath(content_dir)
+        self.template_file_path = os.path.abspath(template_file_path)
+        self.static_dir = os.path.abspath(static_dir)
+        self.pages = {}
+        self.dependencies = {}
+        # Number of invalidations and BuildContext, None until a page is
+        # rendered
+        self._build = (0, None)
+        self._clients = set()
+
+    def resolve(self, url_path):
+        """
+        Return a ("page", markdown_path) or ("static", file_path) tuple
+        for the URL path of a request, or None if nothing matches
+        """
+        relative = os.path.normpath(unquote(url_path).lstrip("/"))
+        if relative.startswith(".."):
+            return None
+        if relative == ".":
+            relative = ""
+
+        markdown_candidates = [os.path.join(relative, "index.md")]
+        if relative.endswith(".html"):
+            markdown_candidates.insert(0, relative[: -len(".html")] + ".md")
+        for candidate in markdown_candidates:
+            markdown_path = os.path.join(self.content_dir, candidate)
+            if os.path.isfile(markdown_path):
+                return "page", markdown_path
+
+        static_path = os.path.join(self.static_dir, relative)
+        if relative and os.path.isfile(static_path):
+            return "static", static_path
+        return None
+
+    def render(self, markdown_path):
+        """
+        Return the HTML of a page, from memory or converted now.
+        Conversion errors are raised.
+        """
+        if markdown_path in self.pages:
+            return self.pages[markdown_path]
+        generation, context = self._current_build()
+        html, inputs = self._convert(markdown_path, context)
+        self._store(markdown_path, html, inputs, generation)
+        return html
+
+    def _current_build(self):
+        """
+        Return the number of invalidations and the BuildContext to render
+        pages with, created after a template change
+        """
+        generation, context = self._build
+        if context is None:
+            context = BuildContext(self.content_dir, self.template_file_path)
+            self._build = (generation, context)
+        return generation, context
+
+    def _convert(self, markdown_path, context):
+        """
+        Return the HTML of a page and the set of files it was rendered from.
+        Runs in an executor thread, conversion errors are raised.
+        """
+        # Register the section templates between the content root and the page
+        page_dir = os.path.dirname(markdown_path)
+        relative_dir = os.path.relpath(page_dir, self.content_dir)
+        dir_path = self.content_dir
+        for part in [] if relative_dir == "." else relative_dir.split(os.sep):
+            dir_path = os.path.join(dir_path, part)
+            template_path = os.path.join(dir_path, context.TEMPLATE_NAME)
+            if (
+                dir_path not in context.section_templates
+                and os.path.isfile(template_path)
+            ):
+                context.add_section_template(dir_path)
+
+        template_file_path = context.template_path_for(page_dir)
+        template = context.load_template(template_file_path)
+        if template is None:
+            raise ValueError("Template could not be read")
+        markdown_content = _read_file_safely(markdown_path, "reading")
+        if markdown_content is None:
+            raise ValueError(f"Page could not be read: {markdown_path}")
+
+        html = _render_page(markdown_content, template)
+        if "</body>" in html:
+            html = html.replace("</body>", f"{RELOAD_SCRIPT}</body>", 1)
+        else:
+            html += RELOAD_SCRIPT
+        return html, {markdown_path, template_file_path}
+
+    def _store(self, markdown_path, html, inputs, generation):
+        """
+        Keep a converted page in memory, unless an invalidation happened
+        since generation
+        """
+        if generation == self._build[0]:
+            self.pages[markdown_path] = html
+            self.dependencies[markdown_path] = inputs
+
+    def invalidate(self, changes):
+        """
+        Forget the pages depending on the changed paths.
+        Adding or removing a section template changes the template of the
+        pages under its directory, they are forgotten too.
+        Static files are not page inputs, pages are kept when they change.
+        """
+        generation, context = self._build
+        stale = set()
+        for path in changes:
+            if (
+                os.path.basename(path) == BuildContext.TEMPLATE_NAME
+                or path == self.template_file_path
+            ):
+                # Templates and section templates are read again
+                context = None
+                section_prefix = os.path.dirname(path) + os.sep
+                if path.startswith(self.content_dir + os.sep):
+                    stale.update(
+                        page for page in self.pages
+                        if page.startswith(section_prefix)
+                    )
+            stale.update(
+                page for page, inputs in self.dependencies.items()
+                if path in inputs
+            )
+        self._build = (generation + 1, context)
+        for page in stale:
+            self.pages.pop(page, None)
+            self.dependencies.pop(page, None)
+
+    def notify_reload(self):
+        """
+        Tell every open browser to reload the page
+        """
+        for queue in self._clients:
+            queue.put_nowait("reload")
+
+    async def serve(self, host="127.0.0.1", port=8888, watch=True):
+        """
+        Serve until cancelled, watching the content, static files and
+        template for changes if watch is True
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        address = server.sockets[0].getsockname()
+        print(
+            f"Serving on http://{address[0]}:{address[1]}/, "
+            "press Ctrl+C to stop"
+        )
+        async with server:
+            if watch:
+                await asyncio.gather(server.serve_forever(), self.watch())
+            else:
+                await server.serve_forever()
+
+    async def watch(self):
+        """
+        Invalidate pages and notify browsers each time watched files change.
+        The blocking Watcher runs in a thread of the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        watcher = Watcher(
+            [self.content_dir, self.static_dir, self.template_file_path])
+        try:
+            while True:
+                changes = await loop.run_in_executor(
+                    None, watcher.wait_for_changes, 1.0)
+                if changes:
+                    self.invalidate(changes)
+                    self.notify_reload()
+        finally:
+            watcher.close()
+
+    async def handle(self, reader, writer):
+        """
+        Handle one HTTP request
+        """
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass  # Headers are not used
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                return
+            method, target, _ = parts
+            url_path = urlsplit(target).path
+
+            if method not in ("GET", "HEAD"):
+                await self._respond(writer, 405, b"Method not allowed")
+            elif url_path == EVENTS_PATH:
+                await self._stream_events(reader, writer)
+            else:
+                await self._serve_path(writer, url_path, method == "HEAD")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_path(self, writer, url_path, head_only):
+        """
+        Respond with the page or static file matching url_path
+        """
+        resolved = self.resolve(url_path)
+        if resolved is None:
+            await self._respond(writer, 404, b"Not found", head_only=head_only)
+            return
+
+        kind, path = resolved
+        if kind == "static":
+            await self._serve_static(writer, path, head_only)
+            return
+
+        try:
+            html = await self._render_in_thread(path)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # A broken page is reported to the browser, the server keeps
+            # running
+            await self._respond(
+                writer, 500, f"Error rendering {path}: {e}".encode(),
+                head_only=head_only,
+            )
+            return
+        await self._respond(
+            writer, 200, html.encode("UTF-8"), "text/html; charset=utf-8",
+            head_only
+        )
+
+    async def _serve_static(self, writer, path, head_only):
+        """
+        Respond with a static file, read in a thread of the default executor
+        """
+        try:
+            body = await asyncio.get_running_loop().run_in_executor(
+                None, _read_bytes, path
+            )
+        except FileNotFoundError:  # Removed since it was resolved
+            await self._respond(writer, 404, b"Not found", head_only=head_only)
+            return
+        except OSError as e:
+            await self._respond(
+                writer, 500, f"Error reading {path}: {e}".encode(),
+                head_only=head_only,
+            )
+            return
+        content_type = (
+            mimetypes.guess_type(path)[0] or "application/octet-stream")
+        await self._respond(writer, 200, body, content_type, head_only)
+
+    async def _render_in_thread(self, markdown_path):
+        """
+        render() for the event loop: the build is read and the page stored
+        on the loop, where invalidations run, and the conversion runs in a
+        thread so other requests are not blocked
+        """
+        if markdown_path in self.pages:
+            return self.pages[markdown_path]
+        generation, context = self._current_build()
+        html, inputs = await asyncio.get_running_loop().run_in_executor(
+            None, self._convert, markdown_path, context
+        )
+        self._store(markdown_path, html, inputs, generation)
+        return html
+
+    async def _stream_events(self, reader, writer):
+        """
+        Keep the connection open and send a reload event on each change,
+        until the browser closes it
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n"
+        )
+        await writer.drain()
+        queue = asyncio.Queue()
+        self._clients.add(queue)
+        # The browser sends nothing more, the read ends when it disconnects
+        disconnected = asyncio.ensure_future(reader.read())
+        event = None
+        try:
+            while True:
+                event = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    (event, disconnected), return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected in done:
+                    return
+                writer.write(f"data: {event.result()}\n\n".encode())
+                await writer.drain()
+        finally:
+            self._clients.discard(queue)
+            disconnected.cancel()
+            if event is not None:
+                event.cancel()
+
+    @staticmethod
+    async def _respond(
+        writer, status, body, content_type="text/plain; charset=utf-8",
+        head_only=False,
+    ):
+        """
+        Write a complete HTTP response and close the connection
+        """
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Cache-Control: no-store\r\nConnection: close\r\n\r\n".encode()
+        )
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
+
+def _read_bytes(path):
+    """
+    Return the content of a binary file
+    """
+    with open(path, "rb") as f:
+        return f.read()
@@ -1,13 +1,66 @@
 """
-This module holds the generator functions for the site and three helper function
-to read file safely, list directory safely, and write file safely
+This module holds the generator functions for the site and helper functions
+to read file safely, scan directory safely, write file safely and compare
+a file with its new content
 """
 
+import errno
+import hashlib
 import os
 import shutil
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 
-from src.config import DOCS_DIR, STATIC_DIR
-from src.converter import extract_title, markdown_to_html_node
+from src.config import (
+    COPY_THREADS,
+    DOCS_DIR,
+    PAGE_CACHE_SIZE,
+    STATIC_DIR,
+    WRITER_THREADS,
+)
+from src.converter import (
+    configure,
+    extract_title,
+    get_settings,
+    markdown_to_html_node,
+    set_profile,
+    split_front_matter,
+)
+from src.leafnode import LeafNode
+from src.manifest import BuildManifest, hash_content
+from src.pagecache import PageCache
+from src.template import Template
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# A markdown file to convert, found by the content discovery.
+# mtime_ns and size come from the stat made during the discovery, a source
+# with the modification time and size recorded in the manifest is not read.
+PageJob = namedtuple(
+    "PageJob",
+    ["source_path", "output_path", "template_path", "mtime_ns", "size"],
+)
+
+# A source read less than this many nanoseconds after its last modification
+# may change again with the same modification time and size, its hash is
+# then not recorded by stat in the manifest
+RECENT_SOURCE_NS = 2_000_000_000
+
+# Options of a page build, see generate_pages_recursive
+BuildOptions = namedtuple(
+    "BuildOptions",
+    [
+        "manifest_path", "jobs", "cache_dir", "cache_size", "writers",
+        "profile", "changes",
+    ],
+    defaults=[None, 1, None, PAGE_CACHE_SIZE, WRITER_THREADS, None, None],
+)
 
 
 def _read_file_safely(file_path, operation_name):
@@ -28,12 +81,13 @@ def _read_file_safely(file_path, operation_name):
         return None
 
 
-def _list_directory_safely(dir_path):
+def _scan_directory_safely(dir_path):
     """
-    Helper function to list directory contents with error handling
+    Helper function to list the DirEntry of a directory with error handling
     """
     try:
-        return os.listdir(dir_path)
+        with os.scandir(dir_path) as entries:
+            return list(entries)
     except FileNotFoundError:
         print(f"File not found: {dir_path}")
         return None
@@ -45,104 +99,901 @@ def _list_directory_safely(dir_path):
         return None
 
 
-def _write_file_safely(file_path, content, operation_name="writing"):
+def _write_file_safely(
+    file_path, content, operation_name="writing", keep_same=False
+):
     """
-    Helper function to write a file with error handling
+    Helper function to write a file with error handling.
+    content is either a string or an iterable of string or bytes chunks.
+    The content is written to a temporary file next to file_path then moved
+    in place, so an interrupted build never leaves a half-written file.
+    With keep_same, the bytes are hashed while they are streamed, and an
+    existing file_path holding the same bytes is kept with its modification
+    time instead of being replaced.
+    Return True if file_path was written, False if it was kept and None
+    if it could not be written.
     """
+    temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    digest = hashlib.sha256()
+    size = 0
     try:
-        with open(file_path, "w", encoding="UTF-8") as f:
-            f.write(content)
+        with open(temp_path, "xb") as f:
+            for chunk in (content,) if isinstance(content, str) else content:
+                data = (chunk if isinstance(chunk, bytes)
+                        else chunk.encode("UTF-8"))
+                if keep_same:
+                    digest.update(data)
+                    size += len(data)
+                f.write(data)
+        if keep_same and _file_digest(file_path, size) == digest.hexdigest():
+            os.remove(temp_path)
+            return False
+        os.replace(temp_path, file_path)
         return True
     except PermissionError:
         print(f"Permission denied when {operation_name} {file_path}")
-        return False
     except IsADirectoryError:
         print(f"Cannot write to {file_path}: it's a directory")
-        return False
     except UnicodeEncodeError as e:
         print(f"Encoding error when {operation_name} {file_path}: {e}")
-        return False
     except OSError as e:
         print(f"Error {operation_name} file {file_path}: {e}")
-        return False
+
+    try:
+        os.remove(temp_path)
+    except OSError:
+        pass
+    return None
 
 
-def generator():
+def _file_digest(file_path, size):
     """
-    Generator function :
-    1) remove content in ./docs
-    2) copy all static files from ./static to ./docs
+    Helper function returning the sha256 hex digest of the bytes of
+    file_path, or None if it cannot be read or does not hold size bytes
     """
+    try:
+        if os.path.getsize(file_path) != size:
+            return None
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except OSError:
+        return None
 
-    # Remove all directory content AND the directory itself
+
+def _scan_static(static_dir):
+    """
+    Helper function walking static_dir with os.scandir and returning an
+    (asset, source_path, source_stat) tuple for each file, sorted by asset.
+    asset is the path of the file relative to static_dir.
+    """
+    files = []
+    stack = [(static_dir, "")]
+    while stack:
+        dir_path, prefix = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    asset = os.path.join(prefix, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, asset))
+                    elif entry.is_file():
+                        files.append((asset, entry.path, entry.stat()))
+        except OSError as e:
+            print(f"Error reading directory {dir_path}: {e}")
+    return sorted(files, key=lambda static_file: static_file[0])
+
+
+def _dest_stat(dest_path):
+    """
+    Helper function returning the stat of dest_path, or None if it is missing
+    """
     try:
-        if os.path.exists(DOCS_DIR):
-            shutil.rmtree(DOCS_DIR)
-    except PermissionError:
-        print("Failed to remove public directory: Permission denied")
-    except FileNotFoundError:
-        print("Public directory does not exist")
-    except OSError as e:
-        print(f"Operating system error: {e}")
+        return os.stat(dest_path)
+    except OSError:
+        return None
+
+
+def _same_file_stat(source_stat, dest_stat):
+    """
+    Helper function returning True if the destination file has the size
+    and modification time of the source file, as left by a previous copy
+    """
+    return (
+        source_stat.st_size == dest_stat.st_size
+        and source_stat.st_mtime_ns == dest_stat.st_mtime_ns
+    )
+
+
+class StaticCopier:
+    """
+    Copier of the static files, shared by the copy threads of a sync.
+    - hardlink links the files instead of copying them when both paths
+    are on the same filesystem
+    - threads is the number of copy threads
+    - reflink is True until the filesystem or the platform proves unable
+    to clone files, they are then copied the usual way
+    """
+
+    # ioctl request cloning a file on Linux
+    FICLONE = 0x40049409
+    # Errors telling the filesystem cannot clone any file. Others, such as
+    # EXDEV for two paths on different filesystems, only concern one copy.
+    REFLINK_UNSUPPORTED_ERRORS = (errno.EOPNOTSUPP, errno.ENOTTY)
+
+    def __init__(self, hardlink=False, threads=COPY_THREADS) -> None:
+        self.hardlink = hardlink
+        self.threads = threads
+        self.reflink = fcntl is not None
+
+    def clone(self, source_path, dest_path):
+        """
+        Clone source_path into the new file dest_path without copying its
+        data, on filesystems supporting it (btrfs, xfs...).
+        Return False if the file could not be cloned.
+        """
+        if not self.reflink:
+            return False
+        try:
+            with open(source_path, "rb") as source:
+                with open(dest_path, "wb") as dest:
+                    fcntl.ioctl(dest.fileno(), self.FICLONE, source.fileno())
+        except OSError as e:
+            if e.errno in self.REFLINK_UNSUPPORTED_ERRORS:
+                self.reflink = False
+            return False
+        shutil.copystat(source_path, dest_path)
+        return True
+
+    def copy(self, source_path, dest_path, replace=True):
+        """
+        Copy a static file with error handling.
+        The file is cloned when the filesystem supports it, or with hardlink
+        linked when both paths are on the same filesystem, and copied
+        otherwise.
+        With replace, the file already at dest_path is replaced through a
+        temporary file, so a file hardlinked by a previous sync is never
+        written through. The directory of dest_path must exist.
+        """
+        target_path = dest_path
+        if replace:
+            target_path = (
+                f"{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            linked = False
+            if self.hardlink:
+                try:
+                    os.link(source_path, target_path)
+                    linked = True
+                except OSError:  # Another filesystem, copy instead
+                    pass
+            if not linked and not self.clone(source_path, target_path):
+                # shutil streams the copy with os.sendfile when available
+                shutil.copy2(source_path, target_path)
+            if replace:
+                os.replace(target_path, dest_path)
+            return True
+        except PermissionError:
+            print(f"Permission denied when copying {source_path}")
+        except OSError as e:
+            print(f"Error copying {source_path}: {e}")
+
+        # An incomplete copy has another size or mtime and is copied again
+        if replace:
+            try:
+                os.remove(target_path)
+            except OSError:
+                pass
+        return False
+
+    def sync(self, static_file, dest_dir):
+        """
+        Copy a static file unless dest_dir already holds it.
+        Runs in a copy thread.
+        Return True if the file was copied, False if it was unchanged
+        and None if it could not be copied.
+        """
+        asset, source_path, source_stat = static_file
+        dest_path = os.path.join(dest_dir, asset)
+        dest_stat = _dest_stat(dest_path)
+        if dest_stat is not None and _same_file_stat(source_stat, dest_stat):
+            return False
+        if self.copy(source_path, dest_path, replace=dest_stat is not None):
+            return True
+        return None
 
-    # Create directory and copy the files
 
+def _remove_asset(dest_dir, asset):
+    """
+    Helper function to remove an orphan static file and the directories
+    it leaves empty, up to dest_dir
+    """
+    asset_path = os.path.join(dest_dir, asset)
     try:
-        shutil.copytree(STATIC_DIR, DOCS_DIR)
+        os.remove(asset_path)
     except FileNotFoundError:
-        print("Source directory 'static' not found")
-    except PermissionError:
-        print("Permission denied when copying files")
+        return False
     except OSError as e:
-        print(f"Error copying directory structure: {e}")
+        print(f"Error removing {asset_path}: {e}")
+        return False
 
+    parent = os.path.dirname(asset_path)
+    while os.path.normpath(parent) != os.path.normpath(dest_dir):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+    return True
 
-def generate_pages_recursive(
-    dir_path_content, template_file_path, dest_dir_path, basepath="/"
+
+def sync_static(static_dir, dest_dir, manifest=None, copier=None, assets=None):
+    """
+    Copy the static files to dest_dir with the threads of copier, a default
+    StaticCopier if None, skipping the ones whose size and modification
+    time did not change since they were copied.
+    If a manifest is given, the files copied by the previous sync which
+    are gone from static_dir are removed, every other file of dest_dir,
+    such as generated pages, is kept.
+    assets limits the sync to a set of changed files or directories,
+    relative to static_dir, instead of scanning all of it.
+    Return the numbers of copied, unchanged and removed files.
+    """
+    if copier is None:
+        copier = StaticCopier()
+    gone = None
+    if assets is None:
+        static_files = _scan_static(static_dir)
+    else:
+        static_files, gone = _scan_changed_static(static_dir, assets)
+    # Directories are created once, before the copy threads start
+    directories = {os.path.dirname(asset) for asset, _, _ in static_files}
+    for directory in sorted(directories):
+        try:
+            os.makedirs(os.path.join(dest_dir, directory), exist_ok=True)
+        except OSError as e:
+            print(f"Error creating directory {directory}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, copier.threads)) as executor:
+        results = list(
+            executor.map(partial(copier.sync, dest_dir=dest_dir), static_files)
+        )
+
+    removed = 0
+    if manifest is not None:
+        removed = _record_assets(dest_dir, manifest, static_files, gone)
+    return results.count(True), results.count(False), removed
+
+
+def _scan_changed_static(static_dir, assets):
+    """
+    Helper function returning the (asset, source_path, source_stat) tuples
+    of the static files at or under the given assets, sorted by asset,
+    and the set of the assets gone from static_dir
+    """
+    files = []
+    gone = set()
+    for asset in assets:
+        source_path = os.path.join(static_dir, asset)
+        if os.path.isdir(source_path):
+            files.extend(
+                (os.path.join(asset, sub_asset), path, stat)
+                for sub_asset, path, stat in _scan_static(source_path)
+            )
+            continue
+        try:
+            files.append((asset, source_path, os.stat(source_path)))
+        except OSError:
+            gone.add(asset)
+    return sorted(files, key=lambda static_file: static_file[0]), gone
+
+
+def _record_assets(dest_dir, manifest, static_files, gone=None):
+    """
+    Helper function removing the files of the previous sync which are
+    gone from the static directory and recording the synced ones in
+    manifest. gone is None if static_files holds every static file,
+    or the set of files and directories removed since the previous sync.
+    Return the number of removed files.
+    """
+    synced = {asset for asset, _, _ in static_files}
+    if gone is None:
+        orphans = [asset for asset in manifest.assets if asset not in synced]
+    else:
+        gone_prefixes = tuple(asset + os.sep for asset in gone)
+        orphans = [
+            asset
+            for asset in manifest.assets
+            if asset in gone or asset.startswith(gone_prefixes)
+        ]
+        synced.update(set(manifest.assets).difference(orphans))
+    removed = sum(1 for asset in orphans if _remove_asset(dest_dir, asset))
+    manifest.assets = sorted(synced)
+    return removed
+
+
+def generator(
+    static_dir=STATIC_DIR, dest_dir=DOCS_DIR, manifest_path=None, clean=False,
+    copier=None,
 ):
     """
-    Generate all HTML pages from MD files
+    Generator function :
+    1) with clean, remove content in ./docs
+    2) sync all static files from ./static to ./docs with copier, only new
+    or changed files are copied and, with a manifest, removed files are deleted
     """
-    filesystem_list = _list_directory_safely(dir_path_content)
-    if filesystem_list is None:
+
+    # Remove all directory content AND the directory itself
+    if clean:
+        try:
+            if os.path.exists(dest_dir):
+                shutil.rmtree(dest_dir)
+        except PermissionError:
+            print("Failed to remove public directory: Permission denied")
+        except FileNotFoundError:
+            print("Public directory does not exist")
+        except OSError as e:
+            print(f"Operating system error: {e}")
+
+    if not os.path.isdir(static_dir):
+        print("Source directory 'static' not found")
         return
 
-    template_file = _read_file_safely(template_file_path, "reading")
-    if template_file is None:
+    manifest = None
+    if manifest_path is not None:
+        manifest = BuildManifest.load(manifest_path)
+
+    copied, unchanged, removed = sync_static(
+        static_dir, dest_dir, manifest, copier)
+    print(
+        f"Static files: {copied} copied, {unchanged} unchanged, "
+        f"{removed} removed"
+    )
+
+    if manifest is not None:
+        manifest.save()
+
+
+class BuildContext:
+    """
+    State shared by every page of a build, loaded once and threaded
+    through the content walk.
+    - content_dir is the root of the content tree
+    - basepath is the base path of the deployed site
+    - templates caches each compiled Template by file path, so a template
+    is read and compiled once per build whatever the number of directories
+    - template_hashes caches the hash of each template source
+    - section_templates maps a content directory holding its own
+    template.html to that template path, the template applies to
+    the directory and all its subdirectories
+    """
+
+    TEMPLATE_NAME = "template.html"
+
+    def __init__(self, content_dir, template_file_path, basepath="/") -> None:
+        self.content_dir = content_dir
+        self.template_file_path = template_file_path
+        self.basepath = basepath
+        self.templates = {}
+        self.template_hashes = {}
+        self.section_templates = {}
+        self._resolved_templates = {}
+
+    def load_template(self, template_file_path):
+        """
+        Return the compiled template at template_file_path, reading it
+        only the first time. Return None if the file cannot be read.
+        """
+        if template_file_path not in self.templates:
+            template_file = _read_file_safely(template_file_path, "reading")
+            if template_file is None:
+                return None
+            self.templates[template_file_path] = Template(
+                template_file, self.basepath)
+            self.template_hashes[template_file_path] = hash_content(
+                template_file)
+        return self.templates[template_file_path]
+
+    def add_section_template(self, dir_path):
+        """
+        Register the template.html of a content directory
+        """
+        template_file_path = os.path.join(dir_path, self.TEMPLATE_NAME)
+        if self.load_template(template_file_path) is not None:
+            self.section_templates[dir_path] = template_file_path
+            self._resolved_templates.clear()
+
+    def template_path_for(self, dir_path):
+        """
+        Return the path of the template used by the pages of dir_path,
+        the nearest section template or the default one
+        """
+        if dir_path not in self._resolved_templates:
+            if dir_path in self.section_templates:
+                template_file_path = self.section_templates[dir_path]
+            elif (os.path.normpath(dir_path)
+                  == os.path.normpath(self.content_dir)):
+                template_file_path = self.template_file_path
+            else:
+                parent = os.path.dirname(dir_path)
+                if parent == dir_path:
+                    template_file_path = self.template_file_path
+                else:
+                    template_file_path = self.template_path_for(parent)
+            self._resolved_templates[dir_path] = template_file_path
+        return self._resolved_templates[dir_path]
+
+
+def generate_pages_recursive(
+    dir_path_content, template_file_path, dest_dir_path, basepath="/",
+    options=None,
+):
+    """
+    Generate all HTML pages from MD files.
+    A template.html placed in a content directory replaces the default
+    template for the pages of that directory and its subdirectories.
+    options is a BuildOptions, the defaults are used if it is None:
+    - if manifest_path is given, pages whose markdown, template and basepath
+    did not change since the previous build are skipped
+    - if changes is also given, the set of paths changed since the previous
+    build, only the pages depending on them and the new pages are read,
+    see changed_sources
+    - if jobs is greater than 1, pages are converted by a pool of processes,
+    output files are still written in a deterministic order
+    - if cache_dir is given, converted markdown bodies are kept in a
+    PageCache of at most cache_size bytes and reused by later builds
+    - output files are written by writers threads, each one to a temporary
+    file moved in place once complete
+    - if profile is a BuildProfile, the time of each stage and page is
+    recorded in it. Pages are then converted in this process without
+    the page cache, so the cost of every page is measured.
+    """
+    if options is None:
+        options = BuildOptions()
+    context = BuildContext(dir_path_content, template_file_path, basepath)
+    if context.load_template(template_file_path) is None:
         return
 
-    for entry in filesystem_list:
-        entry_path = os.path.join(dir_path_content, entry)
+    manifest = None
+    if options.manifest_path is not None:
+        manifest = BuildManifest.load(options.manifest_path)
+    dirty_pages, seen_keys = _find_dirty_pages(
+        context, dest_dir_path, manifest, options)
+
+    page_cache = None
+    if (options.cache_dir is not None and dirty_pages
+            and options.profile is None):
+        page_cache = PageCache.open(options.cache_dir, options.cache_size)
+    written, unchanged = _render_and_write_pages(
+        dirty_pages, manifest, page_cache, options
+    )
+    print(
+        f"Pages: {written} written, {unchanged} unchanged, "
+        f"{len(seen_keys) - len(dirty_pages)} up to date"
+    )
+
+    if page_cache is not None:
+        print(
+            f"Page cache: {page_cache.hits} hits, {page_cache.misses} misses")
+        page_cache.close()
+
+    if manifest is not None:
+        manifest.prune(seen_keys)
+        manifest.save()
+
+
+def _find_dirty_pages(context, dest_dir_path, manifest, options):
+    """
+    Discover the pages of the content tree and return the list of pages
+    that need to be rebuilt with the set of the source paths seen,
+    see _collect_dirty_pages
+    """
+    profile = options.profile
+    if profile is None:
+        page_jobs = _discover_pages(
+            context, context.content_dir, dest_dir_path)
+    else:
+        page_jobs = profile.timed(
+            "discover", _discover_pages, context, context.content_dir,
+            dest_dir_path,
+        )
+
+    sources = None
+    if manifest is not None and options.changes is not None:
+        sources = changed_sources(
+            manifest, options.changes, context.content_dir)
+    return _collect_dirty_pages(context, page_jobs, manifest, profile, sources)
 
-        if os.path.isfile(entry_path) and entry_path.endswith(".md"):
-            markdown_content = _read_file_safely(entry_path, "reading")
-            if markdown_content is None:
-                continue
 
-            html_content = markdown_to_html_node(markdown_content).to_html()
+def _render_and_write_pages(dirty_pages, manifest, page_cache, options):
+    """
+    Convert the dirty pages with the options of the build and write them,
+    return the numbers of written and unchanged pages
+    """
+    if options.profile is not None:
+        return _write_profiled_pages(dirty_pages, manifest, options)
+    if options.jobs > 1 and len(dirty_pages) > 1:
+        return _write_pool_pages(dirty_pages, manifest, page_cache, options)
+
+    markdown_contents = [page[3] for page in dirty_pages]
+    templates = [page[4] for page in dirty_pages]
+    if page_cache is not None:
+        rendered_pages = _iter_cached_pages(
+            markdown_contents, templates, page_cache, map)
+    else:
+        # Pages are streamed to their output file chunk by chunk
+        rendered_pages = map(_iter_page, markdown_contents, templates)
+    return _write_pages(dirty_pages, rendered_pages, manifest, options.writers)
 
-            title = extract_title(markdown_content)
 
-            final_html = template_file.replace("{{ Title }}", title).replace(
-                "{{ Content }}", html_content
+def _write_profiled_pages(dirty_pages, manifest, options):
+    """
+    Convert and write the dirty pages in this process, recording the time
+    of each stage and page in the profile of options
+    """
+    profile = options.profile
+    # The converter records the blocks and inline parsing stages
+    previous_profile = set_profile(profile)
+    try:
+        return _write_pages(
+            dirty_pages,
+            _iter_profiled_pages(dirty_pages, profile),
+            manifest,
+            options.writers,
+            profile,
+        )
+    finally:
+        set_profile(previous_profile)
+
+
+def _write_pool_pages(dirty_pages, manifest, page_cache, options):
+    """
+    Convert the dirty pages with a pool of options.jobs processes and
+    write them in page order
+    """
+    markdown_contents = [page[3] for page in dirty_pages]
+    templates = [page[4] for page in dirty_pages]
+    # Workers start with the conversion settings of this process
+    with ProcessPoolExecutor(
+        max_workers=options.jobs,
+        initializer=partial(configure, **get_settings()),
+    ) as executor:
+        chunksize = max(1, len(dirty_pages) // (options.jobs * 4))
+        if page_cache is not None:
+            rendered_pages = _iter_cached_pages(
+                markdown_contents,
+                templates,
+                page_cache,
+                partial(executor.map, chunksize=chunksize),
+            )
+        else:
+            rendered_pages = executor.map(
+                _render_page, markdown_contents, templates, chunksize=chunksize
             )
-            final_html = final_html.replace('href="/', f'href="{basepath}')
-            final_html = final_html.replace('src="/', f'src="{basepath}')
+        return _write_pages(
+            dirty_pages, rendered_pages, manifest, options.writers)
 
-            item_html = entry.replace(".md", ".html")
 
-            os.makedirs(
-                os.path.dirname(os.path.join(dest_dir_path, item_html)), exist_ok=True
+def changed_sources(manifest, changed_paths, content_dir):
+    """
+    Return the source paths of the pages to rebuild after changed_paths
+    changed, relative to content_dir: the pages of manifest depending on
+    a changed markdown file or template, and the pages under the directory
+    of a changed section template, which may be new.
+    Return None if a path is neither a markdown file nor a template,
+    every page must then be checked.
+    """
+    input_names = set()
+    sources = set()
+    for path in changed_paths:
+        key = os.path.relpath(path, content_dir)
+        if os.path.basename(path) == BuildContext.TEMPLATE_NAME:
+            input_names.add(f"template:{key}")
+            section = os.path.dirname(key)
+            if not key.startswith(os.pardir + os.sep):
+                prefix = section + os.sep if section else ""
+                sources.update(
+                    source for source in manifest.pages
+                    if source.startswith(prefix)
+                )
+        elif key.endswith(".md") and not key.startswith(os.pardir + os.sep):
+            input_names.add(f"source:{key}")
+        else:
+            return None
+    return sources | manifest.dependents(input_names)
+
+
+def _collect_dirty_pages(
+    context, page_jobs, manifest, profile=None, sources=None
+):
+    """
+    Read the sources of page_jobs and return the list of pages that need
+    to be rebuilt, with the set of the source paths seen.
+    Pages known to be fresh from the manifest are kept without being read,
+    see _known_fresh.
+    Each dirty page is a (source_key, inputs, output_path, markdown_content,
+    template) tuple, inputs being None without manifest.
+    """
+    read_source = _read_file_safely
+    if profile is not None:
+        read_source = partial(profile.timed, "read", _read_file_safely)
+
+    dirty_pages = []
+    seen_keys = set()
+    for job in page_jobs:
+        source_key = os.path.relpath(job.source_path, context.content_dir)
+        if _known_fresh(context, manifest, job, source_key, sources):
+            seen_keys.add(source_key)
+            continue
+
+        markdown_content = read_source(job.source_path, "reading")
+        if markdown_content is None:
+            continue
+        seen_keys.add(source_key)
+        inputs = None
+        if manifest is not None:
+            source_hash = hash_content(markdown_content)
+            if time.time_ns() - job.mtime_ns > RECENT_SOURCE_NS:
+                manifest.record_source(
+                    source_key, job.mtime_ns, job.size, source_hash)
+            inputs = _page_inputs(
+                context, source_key, source_hash, job.template_path)
+            if manifest.is_fresh(source_key, inputs, job.output_path):
+                continue
+
+        dirty_pages.append(
+            (
+                source_key,
+                inputs,
+                job.output_path,
+                markdown_content,
+                context.templates[job.template_path],
             )
+        )
+    return dirty_pages, seen_keys
+
+
+def _known_fresh(context, manifest, job, source_key, sources):
+    """
+    Helper function returning True if a page recorded in the manifest is
+    fresh without reading its source: either sources, the set of the
+    source paths depending on changed files, does not hold it, or its
+    source has the modification time and size recorded with its hash and
+    its other inputs did not change
+    """
+    if manifest is None or source_key not in manifest.pages:
+        return False
+    if sources is not None:
+        return source_key not in sources
+    source_hash = manifest.source_hash(source_key, job.mtime_ns, job.size)
+    if source_hash is None:
+        return False
+    inputs = _page_inputs(context, source_key, source_hash, job.template_path)
+    return manifest.is_fresh(source_key, inputs, job.output_path)
+
+
+def _discover_pages(context, dir_path_content, dest_dir_path):
+    """
+    Walk the content tree with os.scandir and return a PageJob for each
+    markdown file, in sorted depth-first order.
+    The type cached in each DirEntry saves a stat per entry, only markdown
+    files are stat'ed. Section templates are registered on the way.
+    """
+    jobs = []
+    # Entries left to visit, in reverse order, with their output directory
+    # and the template of their directory
+    stack = []
 
-            output_path = os.path.join(dest_dir_path, item_html)
-            if not _write_file_safely(output_path, final_html):
-                return
+    def push_directory(dir_path, dest_dir):
+        entries = _scan_directory_safely(dir_path)
+        if entries is None:
+            return
+        if any(entry.name == context.TEMPLATE_NAME for entry in entries):
+            context.add_section_template(dir_path)
+        template_file_path = context.template_path_for(dir_path)
+        entries.sort(key=lambda entry: entry.name, reverse=True)
+        for entry in entries:
+            stack.append((entry, dest_dir, template_file_path))
 
-        elif os.path.isdir(entry_path):
-            generate_pages_recursive(
-                entry_path,
-                template_file_path,
-                os.path.join(dest_dir_path, entry),
-                basepath,
+    push_directory(dir_path_content, dest_dir_path)
+    while stack:
+        entry, dest_dir, template_file_path = stack.pop()
+        if entry.is_file() and entry.name.endswith(".md"):
+            try:
+                stat = entry.stat()
+            except OSError as e:
+                print(f"Error reading file {entry.path}: {e}")
+                continue
+            item_html = entry.name.replace(".md", ".html")
+            jobs.append(
+                PageJob(
+                    entry.path,
+                    os.path.join(dest_dir, item_html),
+                    template_file_path,
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
             )
+        elif entry.is_dir():
+            push_directory(entry.path, os.path.join(dest_dir, entry.name))
+    return jobs
+
+
+def _page_inputs(context, source_key, source_hash, template_file_path):
+    """
+    Return the inputs a page is rendered from, mapping each input name
+    of the build manifest to its hash or value
+    """
+    template_key = os.path.relpath(template_file_path, context.content_dir)
+    return {
+        f"source:{source_key}": source_hash,
+        f"template:{template_key}":
+            context.template_hashes[template_file_path],
+        "basepath": context.basepath,
+    }
+
+
+def _render_page(markdown_content, template):
+    """
+    Convert a markdown document into a full HTML page string.
+    Must stay a module level function so it can be sent to worker processes.
+    """
+    return "".join(_iter_page(markdown_content, template))
+
+
+def _iter_page(markdown_content, template):
+    """
+    Convert a markdown document and return an iterator over the chunks
+    of the full HTML page, so it can be written without being joined.
+    The front matter of the document fills the matching template slots.
+    Conversion errors are raised here, before anything is written.
+    """
+    metadata, markdown_body = split_front_matter(markdown_content)
+
+    metadata["Content"] = markdown_to_html_node(markdown_body)
+
+    metadata["Title"] = extract_title(markdown_body)
+
+    return template.iter_chunks(metadata)
+
+
+def _iter_profiled_pages(dirty_pages, profile):
+    """
+    Yield the full HTML of each dirty page, recording the time of the
+    HTML rendering and template stages and of each page in profile.
+    The converter must record in the same profile, see set_profile.
+    """
+    for source_key, _, _, markdown_content, template in dirty_pages:
+        start = time.perf_counter()
+        metadata, markdown_body = split_front_matter(markdown_content)
+        content = markdown_to_html_node(markdown_body)
+        metadata["Title"] = extract_title(markdown_body)
+        html = profile.timed("html", content.to_html)
+        metadata["Content"] = LeafNode(None, html)
+        final_html = profile.timed("template", template.render, metadata)
+        profile.add_page(
+            source_key, time.perf_counter() - start, len(markdown_content))
+        yield final_html
+
+
+def _convert_body(markdown_body):
+    """
+    Convert a markdown body into a (html, title) tuple.
+    Must stay a module level function so it can be sent to worker processes.
+    """
+    return (
+        markdown_to_html_node(markdown_body).to_html(),
+        extract_title(markdown_body),
+    )
+
+
+def _iter_cached_pages(markdown_contents, templates, page_cache, convert):
+    """
+    Yield the chunks of each full HTML page, reading the converted bodies
+    from page_cache in page order, so only the page being written holds
+    its HTML. The bodies missing from the cache are converted once each
+    with convert, either map or the map of a process pool, and stored.
+    """
+    pages = [split_front_matter(markdown_content)
+             for markdown_content in markdown_contents]
+    keys = [page_cache.key(markdown_body) for _, markdown_body in pages]
+    missing_keys = page_cache.missing(keys)
+    missing = {}
+    for key, (_, markdown_body) in zip(keys, pages):
+        if key in missing_keys:
+            missing.setdefault(key, markdown_body)
+    # Missing bodies are converted in the order of their first page
+    converted_missing = iter(convert(_convert_body, list(missing.values())))
+
+    for key, (metadata, markdown_body), template in zip(
+        keys, pages, templates
+    ):
+        if key in missing:
+            del missing[key]
+            result = next(converted_missing, None)
+            page_cache.put(key, *result)
+        else:
+            result = page_cache.get(key)
+            if result is None:  # Evicted by another build sharing the cache
+                result = _convert_body(markdown_body)
+                page_cache.put(key, *result)
+        html, metadata["Title"] = result
+        metadata["Content"] = LeafNode(None, html)
+        yield template.iter_chunks(metadata)
+
+
+def _write_page(output_path, final_html, previous_digest=None):
+    """
+    Write a rendered page unless its output file already holds the same
+    HTML, so its modification time is kept. Runs in a writer thread.
+    The page is hashed before anything is written. If previous_digest,
+    the [sha256, size] of the HTML of the previous build, is given, it is
+    compared with it and the output file is not read, otherwise the output
+    file is read to be compared.
+    Return a (status, digest) tuple, status being True if the page was
+    written, False if it was unchanged and None if it could not be written,
+    and digest the [sha256, size] of the HTML of the page.
+    """
+    chunks = []
+    hasher = hashlib.sha256()
+    for chunk in (final_html,) if isinstance(final_html, str) else final_html:
+        data = chunk.encode("UTF-8")
+        hasher.update(data)
+        chunks.append(data)
+    digest = [hasher.hexdigest(), sum(len(data) for data in chunks)]
+
+    if previous_digest is not None:
+        dest_stat = _dest_stat(output_path)
+        if (
+            digest == previous_digest
+            and dest_stat is not None
+            and dest_stat.st_size == digest[1]
+        ):
+            return False, digest
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    status = _write_file_safely(
+        output_path, chunks, keep_same=previous_digest is None
+    )
+    return status, digest
+
+
+def _write_pages(
+    dirty_pages, rendered_pages, manifest, writers=WRITER_THREADS, profile=None
+):
+    """
+    Write rendered pages with a pool of writer threads, so pages are
+    converted while the previous ones are written, and record them in
+    the manifest in page order.
+    At most twice as many pages as writers wait to be written.
+    A page that could not be written is not recorded so it is rebuilt next
+    time.
+    The time of each write is recorded in profile if given.
+    Return the numbers of written and unchanged pages.
+    """
+    counts = {True: 0, False: 0, None: 0}
+    pending = deque()
+
+    def collect_oldest():
+        page, future = pending.popleft()
+        status, digest = future.result()
+        counts[status] += 1
+        if status is not None and manifest is not None:
+            source_key, inputs, output_path = page[:3]
+            manifest.record(source_key, output_path, inputs, digest)
+
+    write_page = _write_page
+    if profile is not None:
+        write_page = partial(profile.timed, "write", _write_page)
+
+    with ThreadPoolExecutor(max_workers=max(1, writers)) as executor:
+        for page, final_html in zip(dirty_pages, rendered_pages):
+            previous_digest = None
+            if manifest is not None:
+                previous_digest = manifest.output_digest(page[0])
+            future = executor.submit(
+                write_page, page[2], final_html, previous_digest)
+            pending.append((page, future))
+            if len(pending) > 2 * writers:
+                collect_oldest()
+        while pending:
+            collect_oldest()
+    return counts[True], counts[False]
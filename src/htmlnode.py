@@ -2,6 +2,59 @@
 HTMLNode Parent class module
 """
 
+# Attribute strings of the props dictionnaries already rendered,
+# shared by every node with equal props. Cleared when full.
+PROPS_CACHE_SIZE = 4096
+_props_html_cache = {}
+
+
+def _attributes_to_html(props):
+    """
+    Returns the attributes of a props dictionnary separated by a space
+    (handles nested dictionaries)
+    """
+    attributes = []
+    for key, value in props.items():
+        if isinstance(value, dict):  # Handle nested dictionaries
+            if key == "style":
+                # Flatten style dict properly
+                style_string = "; ".join(
+                    [f"{k}:{v}" for k, v in value.items()])
+                attributes.append(f'{key}="{style_string}"')
+            else:
+                # No leading/trailing space in nested
+                nested = _attributes_to_html(value).strip()
+                attributes.append(f'{key}="{nested}"')
+        else:
+            # Standard key-value pair
+            attributes.append(f'{key}="{value}"')
+    return " ".join(attributes)  # Join attributes with a single space
+
+
+def props_to_html(props):
+    """
+    Returns the string of HTML attributes of a props dictionnary.
+    Dictionnaries holding only strings are looked up in the shared cache,
+    others (numbers, nested dictionnaries...) are always built.
+    """
+    if not props:
+        return ""
+    try:
+        key = tuple(props.items())
+        html = _props_html_cache.get(key)
+    except TypeError:  # Unhashable value such as a nested dictionnary
+        return " " + _attributes_to_html(props)
+    if html is not None:
+        return html
+
+    html = " " + _attributes_to_html(props)
+    # Only strings are cached, so 1 and True cannot share an entry
+    if all(isinstance(value, str) for value in props.values()):
+        if len(_props_html_cache) >= PROPS_CACHE_SIZE:
+            _props_html_cache.clear()
+        _props_html_cache[key] = html
+    return html
+
 
 class HTMLNode:
     """
@@ -17,36 +70,21 @@ class HTMLNode:
     - An HTMLNode without a value will be assumed to have children
     - An HTMLNode without children will be assumed to have a value
     - An HTMLNode without props simply won't have any attributes
+
+    Instances have no __dict__, subclasses must declare __slots__ too.
+    tag and value are plain attributes, children and props are validated.
+    The attribute string of props is computed once and forgotten when
+    props is set again, a props dictionnary changed in place is not seen.
     """
 
+    __slots__ = ("tag", "value", "_children", "_props", "_props_html")
+
     def __init__(self, tag=None, value=None, children=None, props=None) -> None:
-        self._tag = tag
-        self._value = value
-        self._children = []
-        self._props = props
+        self.tag = tag
+        self.value = value
         self.children = children
-
-    @property
-    def tag(self):
-        """
-        Getter for tag member
-        """
-        return self._tag
-
-    @tag.setter
-    def tag(self, tag):
-        self._tag = tag
-
-    @property
-    def value(self):
-        """
-        Getter for value member
-        """
-        return self._value
-
-    @value.setter
-    def value(self, value):
-        self._value = value
+        self._props = props
+        self._props_html = None
 
     @property
     def children(self):
@@ -75,6 +113,7 @@ class HTMLNode:
         if props is not None and not isinstance(props, dict):
             raise ValueError("Props must be a dictionary.")
         self._props = props
+        self._props_html = None
 
     def to_html(self):
         """
@@ -82,38 +121,29 @@ class HTMLNode:
         """
         raise NotImplementedError("This method must be override by children")
 
+    def iter_html(self):
+        """
+        Yield the HTML of the node as a sequence of string chunks.
+        Subclasses can override it to avoid building the whole string,
+        by default the result of to_html is yielded as a single chunk.
+        """
+        yield self.to_html()
+
+    def render_to(self, stream):
+        """
+        Write the HTML of the node chunk by chunk to a file-like object
+        """
+        for chunk in self.iter_html():
+            stream.write(chunk)
+
     def props_to_html(self):
         """
         Returns a string that represents the HTML attributes
         of the node (handles nested dictionaries).
         """
-
-        def process_dict(d):
-            if not d:  # Base case: no attributes
-                return ""
-
-            attributes = []
-            for key, value in d.items():
-                if isinstance(value, dict):  # Handle nested dictionaries
-                    if key == "style":
-                        # Flatten style dict properly
-                        style_string = "; ".join(
-                            [f"{k}:{v}" for k, v in value.items()])
-                        attributes.append(f'{key}="{style_string}"')
-                    else:
-                        nested = process_dict(
-                            value
-                        ).strip()  # No leading/trailing space in nested
-                        attributes.append(f'{key}="{nested}"')
-                else:
-                    # Standard key-value pair
-                    attributes.append(f'{key}="{value}"')
-            return " ".join(attributes)  # Join attributes with a single space
-
-        # Call the recursive helper with self.props
-        if not self.props:
-            return ""
-        return " " + process_dict(self.props)
+        if self._props_html is None:
+            self._props_html = props_to_html(self._props)
+        return self._props_html
 
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
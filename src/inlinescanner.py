@@ -0,0 +1,249 @@
+"""
+This module hold the class InlineScanner, a single-pass alternative
+to the split_nodes_image / split_nodes_link / split_nodes_delimiter
+pipeline of MarkdownNodes producing the same TextNode list
+"""
+
+import re
+
+from src.markdownnode import MarkdownNodes
+from src.textnode import (
+    CODE_STYLES,
+    NO_STYLES,
+    NORMAL_STYLES,
+    SINGLE_STYLES,
+    TextNode,
+    TextType,
+)
+
+#    INLINE_PATTERN = r"""
+#    !\[([^\[\]]*)\]\(([^\(\)]*)\)          # image, same as IMAGE_PATTERN
+#    |                                      # or
+#    (?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)     # link, same as LINK_PATTERN
+#    """
+INLINE_PATTERN = re.compile(
+    r"!\[(?P<alt>[^\[\]]*)\]\((?P<src>[^\(\)]*)\)"
+    r"|(?<!!)\[(?P<anchor>[^\[\]]*)\]\((?P<href>[^\(\)]*)\)"
+)
+
+# Emphasis delimiters in the priority order of split_nodes_delimiter,
+# with the style they add. The single underscore is the fallback.
+EMPHASIS_DELIMITERS = (
+    ("`", None),
+    ("***", None),
+    ("**", TextType.BOLD),
+    ("__", TextType.BOLD),
+    ("*", TextType.ITALIC),
+)
+
+IMAGE_STYLES = SINGLE_STYLES[TextType.IMAGE]
+LINK_STYLES = SINGLE_STYLES[TextType.LINK]
+
+
+def _forward_finder(text):
+    """
+    Return a function giving the same result as text.find(sub, start, end),
+    with a memory of the last result for each searched string.
+    The scanner walks the text from left to right, so most searches start
+    before the last occurrence found and are answered without scanning again.
+    """
+    last = {}
+
+    def find(sub, start, end):
+        found = last.get(sub)
+        searched_before = found is not None and found[0] <= start
+        if searched_before and (found[1] == -1 or found[1] >= start):
+            pos = found[1]
+        else:
+            # First occurrence in the whole text, valid for later searches
+            pos = text.find(sub, start)
+            last[sub] = (start, pos)
+        if pos == -1 or pos + len(sub) > end:
+            return -1
+        return pos
+
+    return find
+
+
+class InlineScanner:
+    """
+    Class holding the single-pass inline parser.
+    Images and links are located in one regex walk, the text between them
+    is split on emphasis delimiters with an explicit stack of segments
+    instead of recursion, and segments are handled by index so no
+    intermediate string is built.
+    """
+
+    @classmethod
+    def text_to_textnodes(cls, text, validate=True):
+        """
+        Creates the TextNode objects list in one walk over the text.
+        With validate False only the urls of images and links are checked.
+        """
+        if not text:
+            raise ValueError("Nodes list cannot be empty")
+
+        matches = list(INLINE_PATTERN.finditer(text))
+        spans = []
+        for match in matches:
+            if match.group("src") is not None:
+                node = TextNode(match.group("alt"),
+                                IMAGE_STYLES, match.group("src"))
+            else:
+                node = TextNode(
+                    match.group("anchor"), LINK_STYLES, match.group("href"))
+            spans.append((match.start(), match.end(), node))
+        # Images and links are validated before any emphasis is parsed,
+        # as in the MarkdownNodes pipeline
+        if spans and validate:
+            MarkdownNodes.validate_textnodes([node for _, _, node in spans])
+        elif spans:
+            MarkdownNodes.validate_urls([node for _, _, node in spans])
+
+        nodes = []
+        find = _forward_finder(text)
+        position = 0
+        for start, end, node in spans:
+            cls.split_emphasis(text, (position, start), find, nodes)
+            nodes.append(node)
+            position = end
+        cls.split_emphasis(text, (position, len(text)), find, nodes)
+        return nodes
+
+    @classmethod
+    def split_emphasis(cls, text, segment, find, nodes):
+        """
+        Append to nodes the TextNode of the (start, end) segment of text
+        split on emphasis delimiters, with the same rules as
+        split_nodes_delimiter. find is the _forward_finder of text.
+        """
+        stack = [(segment, NO_STYLES)]
+        while stack:
+            segment, styles = stack.pop()
+            seg_start, seg_end = segment
+            if seg_start >= seg_end:
+                continue
+
+            found = cls.first_delimiter(find, segment)
+            if found is None:
+                nodes.append(
+                    TextNode(text[seg_start:seg_end], styles or NORMAL_STYLES))
+                continue
+
+            first_pos, delimiter, new_style = found
+            second_pos = cls.matching_delimiter(
+                text, segment, delimiter, first_pos)
+            if first_pos > seg_start:
+                nodes.append(TextNode(
+                    text[seg_start:first_pos], styles or NORMAL_STYLES))
+
+            between_styles = MarkdownNodes.apply_style(
+                delimiter, styles, new_style)
+            # Remaining text is pushed first so the between text is handled
+            # first
+            stack.append(((second_pos + len(delimiter), seg_end), styles))
+            first_pos += len(delimiter)
+            if between_styles is CODE_STYLES:
+                nodes.append(
+                    TextNode(text[first_pos:second_pos], between_styles))
+            else:
+                stack.append(((first_pos, second_pos), between_styles))
+
+    @classmethod
+    def first_delimiter(cls, find, segment):
+        """
+        Return a (position, delimiter, new_style) tuple for the delimiter
+        that split_nodes_delimiter would pick in the segment, or None
+        """
+        positions = cls.delimiter_positions(find, segment)
+        if all(pos == -1 for pos in positions):
+            return None
+
+        for index, (delimiter, new_style) in enumerate(EMPHASIS_DELIMITERS):
+            others = positions[:index] + positions[index + 1:]
+            if MarkdownNodes.is_first_position(positions[index], others):
+                return positions[index], delimiter, new_style
+
+        first_single_underscore = positions[-1]
+        if first_single_underscore == -1:
+            return None
+        return first_single_underscore, "_", TextType.ITALIC
+
+    @classmethod
+    def delimiter_positions(cls, find, segment):
+        """
+        Return the first position of each delimiter in the segment, in the
+        order of EMPHASIS_DELIMITERS followed by the single underscore
+        """
+        seg_start, seg_end = segment
+        # Position used by find_delimiters_first_position when a delimiter
+        # is missing, its relative -1 becomes seg_start - 1 here
+        missing = seg_start - 1
+
+        # Same adjustments as MarkdownNodes.find_delimiters_first_position,
+        # on absolute positions bounded by the segment
+        first_triple_asterisk = find("***", seg_start, seg_end)
+        first_double_asterisk = find("**", seg_start, seg_end)
+        first_single_asterisk = find("*", seg_start, seg_end)
+        first_single_underscore = find("_", seg_start, seg_end)
+        first_double_underscore = find("__", seg_start, seg_end)
+
+        if first_single_asterisk == first_double_asterisk:
+            base = (
+                missing if first_double_asterisk == -1
+                else first_double_asterisk
+            )
+            first_single_asterisk = find("*", base + 2, seg_end)
+        if first_single_asterisk == first_triple_asterisk:
+            base = (
+                missing if first_triple_asterisk == -1
+                else first_triple_asterisk
+            )
+            first_single_asterisk = find("*", base + 3, seg_end)
+        if first_single_underscore == first_double_underscore:
+            base = (
+                missing if first_double_underscore == -1
+                else first_double_underscore
+            )
+            first_single_underscore = find("_", base + 2, seg_end)
+        if first_double_asterisk == first_triple_asterisk:
+            base = (
+                missing if first_triple_asterisk == -1
+                else first_triple_asterisk
+            )
+            first_double_asterisk = find("**", base + 3, seg_end)
+
+        return (
+            find("`", seg_start, seg_end),
+            first_triple_asterisk,
+            first_double_asterisk,
+            first_double_underscore,
+            first_single_asterisk,
+            first_single_underscore,
+        )
+
+    @classmethod
+    def matching_delimiter(cls, text, segment, delimiter, first_pos):
+        """
+        Find the delimiter closing the one at first_pos, with the same rules
+        as MarkdownNodes.find_matching_delimiter on the (start, end) segment
+        """
+        seg_start, seg_end = segment
+        char = delimiter[0]
+        second_pos = text.find(delimiter, first_pos + len(delimiter), seg_end)
+        if delimiter in ("*", "_"):
+            while second_pos != -1 and (
+                (second_pos > seg_start and text[second_pos - 1] == char)
+                or (second_pos < seg_end - 1 and text[second_pos + 1] == char)
+            ):
+                second_pos = text.find(delimiter, second_pos + 1, seg_end)
+        elif delimiter in ("**", "__"):
+            while second_pos != -1 and (
+                (second_pos > seg_start and text[second_pos - 1] == char)
+                or (second_pos < seg_end - 2 and text[second_pos + 2] == char)
+            ):
+                second_pos = text.find(delimiter, second_pos + 1, seg_end)
+
+        if second_pos == -1:
+            raise ValueError(f"No matching delimiter {delimiter}")
+        return second_pos
@@ -11,6 +11,8 @@ class LeafNode(HTMLNode):
     and must have tag and value. props is optional
     """
 
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None) -> None:
         super().__init__(tag, value, None, props)
 
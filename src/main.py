@@ -4,18 +4,319 @@
 Main module for MD-HTML Project
 """
 
+import argparse
+import asyncio
+import cProfile
+import os
 import sys
 
-from src.config import CONTENT_DIR, DOCS_DIR, TEMPLATE_FILE
-from src.generator import generate_pages_recursive
+from src.config import (
+    CACHE_DIR,
+    CONTENT_DIR,
+    COPY_THREADS,
+    DOCS_DIR,
+    MANIFEST_FILE,
+    PAGE_CACHE_SIZE,
+    STATIC_DIR,
+    TEMPLATE_FILE,
+    WATCH_BLOCK_CACHE_SIZE,
+    WRITER_THREADS,
+)
+from src.converter import INLINE_PARSERS, block_cache_info, configure
+from src.devserver import DevServer
+from src.generator import (
+    BuildOptions,
+    StaticCopier,
+    generate_pages_recursive,
+    generator,
+    sync_static,
+)
+from src.manifest import BuildManifest
+from src.profiler import BuildProfile
+from src.watcher import Watcher
 
 
 def main():
     """
     The main function
     """
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
-    generate_pages_recursive(CONTENT_DIR, TEMPLATE_FILE, DOCS_DIR, basepath)
+    if sys.argv[1:2] == ["serve"]:
+        serve(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Build the site into docs/, "
+        "or run 'main.py serve' to serve it without building"
+    )
+    parser.add_argument(
+        "basepath", nargs="?", default="/",
+        help="base path of the deployed site",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes used to convert pages",
+    )
+    parser.add_argument(
+        "--writers",
+        type=int,
+        default=WRITER_THREADS,
+        help="number of threads writing output files",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="remove docs/ before the build instead of syncing it",
+    )
+    parser.add_argument(
+        "--hardlink",
+        action="store_true",
+        help="hardlink static files into docs/ instead of copying them",
+    )
+    parser.add_argument(
+        "--copy-threads",
+        type=int,
+        default=COPY_THREADS,
+        help="number of threads copying static files",
+    )
+    parser.add_argument(
+        "--inline-parser",
+        choices=sorted(INLINE_PARSERS),
+        default="pipeline",
+        help="implementation used to parse inline markdown",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="skip the validation of the nodes built by the inline parser",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=CACHE_DIR,
+        help="directory of the cache of converted pages shared by builds",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=PAGE_CACHE_SIZE,
+        help="maximum size in bytes of the cached pages",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="convert every changed page without the page cache",
+    )
+    parser.add_argument(
+        "--block-cache-size",
+        type=int,
+        default=0,
+        help="number of converted blocks kept in memory to reuse repeated "
+        "blocks, 0 disables it, each --jobs worker has its own cache",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print the time of each build stage and the slowest pages",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="same as --timings and write the timings to FILE if it ends with "
+        ".json, or the cProfile stats of the page build otherwise",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and rebuild the changed pages and static files",
+    )
+    args = parser.parse_args()
+
+    block_cache_size = args.block_cache_size
+    if args.watch and not block_cache_size:
+        block_cache_size = WATCH_BLOCK_CACHE_SIZE
+    configure(
+        inline_parser=args.inline_parser,
+        validate_textnodes=not args.fast,
+        block_cache_size=block_cache_size,
+    )
+
+    # The copier remembers between syncs whether files can be cloned
+    copier = StaticCopier(args.hardlink, args.copy_threads)
+    sync_static_files(args, copier)
+    build_pages(args)
+    if args.watch:
+        watch(args, copier)
+
+
+def sync_static_files(args, copier):
+    """
+    Sync static/ to docs/ with the command line options
+    """
+    generator(STATIC_DIR, DOCS_DIR, MANIFEST_FILE, args.clean, copier)
+
+
+def sync_static_changes(changes, copier):
+    """
+    Sync the changed static files to docs/, without scanning static/
+    """
+    static_dir = os.path.abspath(STATIC_DIR)
+    assets = {os.path.relpath(path, static_dir) for path in changes}
+    if os.curdir in assets:  # static/ itself changed
+        assets = None
+    manifest = BuildManifest.load(MANIFEST_FILE)
+    copied, unchanged, removed = sync_static(
+        STATIC_DIR, DOCS_DIR, manifest, copier, assets)
+    print(
+        f"Static files: {copied} copied, {unchanged} unchanged, "
+        f"{removed} removed"
+    )
+    manifest.save()
+
+
+def build_pages(args, changes=None):
+    """
+    Build the changed pages with the command line options.
+    changes is the set of paths changed since the previous build, if known.
+    """
+    profile = None
+    if args.timings or args.profile:
+        profile = BuildProfile()
+        if args.jobs > 1 or not args.no_cache:
+            print(
+                "Timings are measured without --jobs and without the page "
+                "cache"
+            )
+    profiler = None
+    if args.profile and not args.profile.endswith(".json"):
+        profiler = cProfile.Profile()
+
+    if profiler is not None:
+        profiler.enable()
+    try:
+        generate_pages_recursive(
+            CONTENT_DIR,
+            TEMPLATE_FILE,
+            DOCS_DIR,
+            args.basepath,
+            BuildOptions(
+                manifest_path=MANIFEST_FILE,
+                jobs=args.jobs,
+                cache_dir=None if args.no_cache else args.cache_dir,
+                cache_size=args.cache_size,
+                writers=args.writers,
+                profile=profile,
+                changes=changes,
+            ),
+        )
+    finally:
+        if profiler is not None:
+            profiler.disable()
+
+    if profile is not None:
+        print(profile.report())
+    if profiler is not None:
+        profiler.dump_stats(args.profile)
+        print(f"cProfile stats written to {args.profile}")
+    elif args.profile and profile.save_json(args.profile):
+        print(f"Timings written to {args.profile}")
+
+    cache_info = block_cache_info()
+    if cache_info is not None and args.jobs <= 1:
+        print(
+            f"Block cache: {cache_info.hits} hits, "
+            f"{cache_info.misses} misses, "
+            f"{cache_info.currsize}/{cache_info.maxsize} blocks"
+        )
+
+
+def watch(args, copier):
+    """
+    Wait for changes of content/, static/ and the template and rebuild.
+    Only the changed static files are synced, --clean only applies to the
+    first build. Only the pages depending on the changed files in the build
+    manifest are read again, and the block cache of this process stays warm
+    between builds.
+    """
+    static_dir = os.path.abspath(STATIC_DIR)
+    watcher = Watcher([CONTENT_DIR, STATIC_DIR, TEMPLATE_FILE])
+    mode = "inotify" if watcher.uses_inotify else "polling"
+    print(f"Watching for changes ({mode}), press Ctrl+C to stop")
+    # Changes of content/ and the template not built yet, kept after a
+    # failed build
+    page_changes = set()
+    try:
+        while True:
+            changes = watcher.wait_for_changes()
+            static_changes = {
+                path
+                for path in changes
+                if path == static_dir or path.startswith(static_dir + os.sep)
+            }
+            page_changes |= changes - static_changes
+            print(f"{len(changes)} changed files, rebuilding")
+            try:
+                if static_changes:
+                    sync_static_changes(static_changes, copier)
+                if page_changes:
+                    build_pages(args, page_changes)
+                    page_changes = set()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # A broken page must not stop the watch
+                print(f"Build failed: {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def serve(argv):
+    """
+    Serve content/ and static/ with pages rendered on demand,
+    for the serve subcommand
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Serve the site, rendering each page when it is requested "
+        "and reloading open browsers when a file changes",
+    )
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on")
+    parser.add_argument("--port", type=int, default=8888,
+                        help="port to listen on")
+    parser.add_argument(
+        "--inline-parser",
+        choices=sorted(INLINE_PARSERS),
+        default="pipeline",
+        help="implementation used to parse inline markdown",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="skip the validation of the nodes built by the inline parser",
+    )
+    parser.add_argument(
+        "--block-cache-size",
+        type=int,
+        default=WATCH_BLOCK_CACHE_SIZE,
+        help=(
+            "number of converted blocks kept in memory to reuse repeated "
+            "blocks"
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    configure(
+        inline_parser=args.inline_parser,
+        validate_textnodes=not args.fast,
+        block_cache_size=args.block_cache_size,
+    )
+    server = DevServer(CONTENT_DIR, TEMPLATE_FILE, STATIC_DIR)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
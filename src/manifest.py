@@ -0,0 +1,158 @@
+"""
+This module holds the BuildManifest class used for incremental builds
+and a helper function to hash file contents
+"""
+
+import hashlib
+import json
+import os
+
+
+def hash_content(content):
+    """
+    Return the sha256 hex digest of a string
+    """
+    return hashlib.sha256(content.encode("UTF-8")).hexdigest()
+
+
+class BuildManifest:
+    """
+    Persistent dependency graph of the previous build.
+    - pages is a dictionnary mapping a source path (relative to the content
+    directory) to its output path, the inputs it was rendered from,
+    a dictionnary mapping each input name to its hash or value, and the
+    [sha256, size] of the HTML written to the output file
+    - sources maps a source path to the [mtime_ns, size, sha256] of the
+    markdown file when it was last read, so a file whose modification time
+    and size did not change is not read and hashed again
+    - assets is the list of static files (relative to the output directory)
+    copied by the previous static sync, the only files a sync may delete
+
+    Input names are built by the generator: "source:<path>" for the
+    markdown of the page, "template:<path>" for its template and "basepath".
+    A page is fresh when it depends on the same inputs with the same hashes
+    and the output file still exists, so a change only rebuilds the pages
+    depending on the changed input.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path=None) -> None:
+        self.path = path
+        self.pages = {}
+        self.sources = {}
+        self.assets = []
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a manifest from path, return an empty manifest if the file
+        is missing or unreadable so the build falls back to a full rebuild
+        """
+        manifest = cls(path)
+        try:
+            with open(path, "r", encoding="UTF-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable build manifest {path}: {e}")
+            return manifest
+
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return manifest
+
+        manifest.pages = data.get("pages", {})
+        manifest.sources = data.get("sources", {})
+        manifest.assets = data.get("assets", [])
+        return manifest
+
+    def save(self):
+        """
+        Write the manifest to its path, return True on success
+        """
+        data = {
+            "version": self.VERSION,
+            "pages": self.pages,
+            "sources": self.sources,
+            "assets": self.assets,
+        }
+        try:
+            with open(self.path, "w", encoding="UTF-8") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            return True
+        except OSError as e:
+            print(f"Error writing build manifest {self.path}: {e}")
+            return False
+
+    def is_fresh(self, source_key, inputs, output_path):
+        """
+        Return True if the page does not need to be rebuilt.
+        inputs maps the name of each input of the page to its current hash.
+        """
+        entry = self.pages.get(source_key)
+        if entry is None:
+            return False
+        return entry["inputs"] == inputs and os.path.isfile(output_path)
+
+    def record(self, source_key, output_path, inputs, output_digest=None):
+        """
+        Record a successfully generated page, its inputs and the
+        [sha256, size] of its HTML if known
+        """
+        self.pages[source_key] = {
+            "output": output_path,
+            "inputs": inputs,
+            "output_digest": output_digest,
+        }
+
+    def output_digest(self, source_key):
+        """
+        Return the [sha256, size] of the HTML written for a page by the
+        previous build, or None if it is unknown
+        """
+        entry = self.pages.get(source_key)
+        if entry is None:
+            return None
+        return entry.get("output_digest")
+
+    def record_source(self, source_key, mtime_ns, size, source_hash):
+        """
+        Record the hash of a source file read with the given modification
+        time and size
+        """
+        self.sources[source_key] = [mtime_ns, size, source_hash]
+
+    def source_hash(self, source_key, mtime_ns, size):
+        """
+        Return the hash recorded for a source file if its modification time
+        and size did not change since, or None
+        """
+        entry = self.sources.get(source_key)
+        if entry is None or entry[:2] != [mtime_ns, size]:
+            return None
+        return entry[2]
+
+    def dependents(self, input_names):
+        """
+        Return the source paths of the recorded pages depending on any
+        of input_names, the pages to rebuild when those inputs change
+        """
+        input_names = set(input_names)
+        return {
+            key
+            for key, entry in self.pages.items()
+            if not input_names.isdisjoint(entry["inputs"])
+        }
+
+    def prune(self, seen_keys):
+        """
+        Forget pages and sources which were not seen during the build
+        """
+        self.pages = {
+            key: entry for key, entry in self.pages.items() if key in seen_keys
+        }
+        self.sources = {
+            key: entry for key, entry in self.sources.items()
+            if key in seen_keys
+        }
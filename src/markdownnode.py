@@ -1,13 +1,53 @@
 """
 This module hold the class MarkDownNodes
-Regexes in place are documented in their respective
-implementation
+Image and link regexes are compiled once at module level
+and documented in their verbose form
 """
 
 import re
 
 from src.basenode import BaseNodes
-from src.textnode import TextNode, TextType
+from src.textnode import (
+    BOLD_ITALIC_STYLES,
+    CODE_STYLES,
+    NO_STYLES,
+    NORMAL_STYLES,
+    SINGLE_STYLES,
+    STYLE_SETS,
+    TextNode,
+    TextType,
+    add_style,
+    intern_styles,
+)
+
+IMAGE_PATTERN = re.compile(
+    r"""
+    !                  # literal exclamation mark
+    \[                 # literal opening bracket
+    ([^\[\]]*)         # first capture group (alt text)
+    \]                 # literal closing bracket
+    \(                 # literal opening paren
+    ([^\(\)]*)         # second capture group (url)
+    \)                 # literal closing paren
+    """,
+    re.VERBOSE,
+)
+
+LINK_PATTERN = re.compile(
+    r"""
+    (?<!!)             # negative lookbehind for !
+    \[                 # literal opening bracket
+    ([^\[\]]*)         # first capture group (link text)
+    \]                 # literal closing bracket
+    \(                 # literal opening paren
+    ([^\(\)]*)         # second capture group (url)
+    \)                 # literal closing paren
+    """,
+    re.VERBOSE,
+)
+
+# Styles of the nodes that must have an url
+URL_STYLES = (SINGLE_STYLES[TextType.IMAGE], SINGLE_STYLES[TextType.LINK])
 
 
 class MarkdownNodes(BaseNodes):
@@ -16,65 +56,50 @@ class MarkdownNodes(BaseNodes):
     """
 
     @classmethod
-    def text_to_textnodes(cls, text):
+    def text_to_textnodes(cls, text, validate=True):
         """
-        Creates the TextNode objects list by calling each split function
+        Creates the TextNode objects list by calling each split function.
+        With validate False the split functions trust the nodes built by
+        the previous one and only the urls taken from the text are checked.
         """
-        nodes = [TextNode(text, {TextType.NORMAL})]
-        return cls.split_nodes_delimiter(
-            cls.split_nodes_link(cls.split_nodes_image(nodes))
-        )
+        nodes = [TextNode(text, NORMAL_STYLES)]
+        if validate:
+            return cls.split_nodes_delimiter(
+                cls.split_nodes_link(cls.split_nodes_image(nodes))
+            )
+
+        if not text:
+            raise ValueError("Nodes list cannot be empty")
+        nodes = cls._split_nodes_link(cls._split_nodes_image(nodes))
+        cls.validate_urls(nodes)
+        return cls._split_nodes_delimiter(nodes)
 
     @classmethod
     def split_nodes_image(cls, nodes):
         """
         Takes a list of nodes and split them based on image delimiter
         """
-
         cls.validate_textnodes(nodes)
+        return cls._split_nodes_image(nodes)
 
-        if len(nodes) == 1 and nodes[0].styles != {TextType.NORMAL}:
+    @classmethod
+    def _split_nodes_image(cls, nodes):
+        """
+        split_nodes_image without validation of the nodes
+        """
+        if len(nodes) == 1 and nodes[0].styles is not NORMAL_STYLES:
             return nodes
         result_nodes = []
 
-        def split_text(text):
-            """
-            Split, create two TextNode if necessary (image delimiter found)
-            and return nodes list
-            """
-            # Base case
-            if not text:
-                return []
-
-            image_nodes = []
-            parsed_text_for_image = cls.extract_markdown_images(text)
-            if len(parsed_text_for_image) == 0:
-                return [TextNode(text, {TextType.NORMAL})]
-
-            # Unpack the tuple returned by the regex
-            alt_text_image, url_image = parsed_text_for_image[0]
-            # Find first delimiter image
-            delimiter = f"![{alt_text_image}]({url_image})"
-            # ['text before', 'text after']
-            sections = text.split(delimiter, 1)
-
-            if sections[0]:
-                image_nodes.append(TextNode(sections[0], {TextType.NORMAL}))
-
-            image_nodes.append(
-                TextNode(alt_text_image, {TextType.IMAGE}, url_image))
-            # Launch recursive call
-            if len(sections) > 1 and sections[1]:
-                image_nodes.extend(split_text(sections[1]))
-
-            return image_nodes
-
         # Process each node
         for node in nodes:
-            if node.styles != {TextType.NORMAL}:
+            if node.styles is not NORMAL_STYLES:
                 result_nodes.append(node)
             else:
-                result_nodes.extend(split_text(node.content))
+                result_nodes.extend(
+                    cls.split_on_matches(
+                        node.content, IMAGE_PATTERN, TextType.IMAGE)
+                )
 
         return result_nodes
 
@@ -84,50 +109,26 @@ class MarkdownNodes(BaseNodes):
         Takes a list of old_nodes and split them based on link delimiter
         """
         cls.validate_textnodes(nodes)
-        if len(nodes) == 1 and nodes[0].styles != {TextType.NORMAL}:
+        return cls._split_nodes_link(nodes)
+
+    @classmethod
+    def _split_nodes_link(cls, nodes):
+        """
+        split_nodes_link without validation of the nodes
+        """
+        if len(nodes) == 1 and nodes[0].styles is not NORMAL_STYLES:
             return nodes
         result_nodes = []
 
-        def split_text(text):
-            """
-            Split, create two TextNode if necessary (link delimiter found)
-            and return nodes list
-            """
-            # Base case
-            if not text:
-                return []
-
-            link_nodes = []
-
-            # Return a list of tuple
-            parsed_text_for_link = cls.extract_markdown_links(text)
-            # Case where there is no link in the TextNode
-            if len(parsed_text_for_link) == 0:
-                return [TextNode(text, {TextType.NORMAL})]
-
-            # Unpack the first tuple returned by the regex
-            link_text, link_url = parsed_text_for_link[0]
-            # Find first delimiter link
-            delimiter = f"[{link_text}]({link_url})"
-            # ['text before', 'text after']
-            sections = text.split(delimiter, 1)
-
-            if sections[0]:
-                link_nodes.append(TextNode(sections[0], {TextType.NORMAL}))
-
-            link_nodes.append(TextNode(link_text, {TextType.LINK}, link_url))
-            # Launch recursive call
-            if len(sections) > 1 and sections[1]:
-                link_nodes.extend(split_text(sections[1]))
-
-            return link_nodes
-
         # Process each node
         for node in nodes:
-            if node.styles != {TextType.NORMAL}:
+            if node.styles is not NORMAL_STYLES:
                 result_nodes.append(node)
             else:
-                result_nodes.extend(split_text(node.content))
+                result_nodes.extend(
+                    cls.split_on_matches(
+                        node.content, LINK_PATTERN, TextType.LINK)
+                )
 
         return result_nodes
 
@@ -138,6 +139,13 @@ class MarkdownNodes(BaseNodes):
         """
         # Validation checks via helper function
         cls.validate_textnodes(nodes)
+        return cls._split_nodes_delimiter(nodes)
+
+    @classmethod
+    def _split_nodes_delimiter(cls, nodes):
+        """
+        split_nodes_delimiter without validation of the nodes
+        """
         result_nodes = []
 
         def split_text(text, current_styles):
@@ -152,7 +160,7 @@ class MarkdownNodes(BaseNodes):
             # No delimiters found
             positions = cls.find_delimiters_first_position(text)
             if all(pos == -1 for pos in positions):
-                return [TextNode(text, current_styles or {TextType.NORMAL})]
+                return [TextNode(text, current_styles or NORMAL_STYLES)]
 
             delimiter = None
             new_style = None
@@ -246,7 +254,7 @@ class MarkdownNodes(BaseNodes):
 
             if first_pos == -1:
                 # No delimiter found, return the text as-is
-                return [TextNode(text, current_styles or {TextType.NORMAL})]
+                return [TextNode(text, current_styles or NORMAL_STYLES)]
 
             second_pos = cls.find_matching_delimiter(
                 text, delimiter, first_pos)
@@ -255,7 +263,7 @@ class MarkdownNodes(BaseNodes):
             if first_pos > 0:
                 nodes.append(
                     TextNode(text[:first_pos],
-                             current_styles or {TextType.NORMAL})
+                             current_styles or NORMAL_STYLES)
                 )
             # We calculate between_text
             between_text = text[first_pos + len(delimiter): second_pos]
@@ -265,7 +273,7 @@ class MarkdownNodes(BaseNodes):
             between_styles = cls.apply_style(
                 delimiter, current_styles, new_style)
 
-            if between_styles == {TextType.CODE}:
+            if between_styles is CODE_STYLES:
                 # We add the node and go directly to extend on the remaining_text
                 nodes.append(TextNode(between_text, between_styles))
             else:
@@ -278,10 +286,10 @@ class MarkdownNodes(BaseNodes):
 
         # Process each node
         for node in nodes:
-            if node.styles != {TextType.NORMAL}:
+            if node.styles is not NORMAL_STYLES:
                 result_nodes.append(node)
             else:
-                result_nodes.extend(split_text(node.content, set()))
+                result_nodes.extend(split_text(node.content, NO_STYLES))
 
         return result_nodes
 
@@ -310,16 +318,18 @@ class MarkdownNodes(BaseNodes):
                         type(node.content)}"
                 )
 
-            # Ensure 'type' matches a valid TextType
-            for style in node.styles:
-                if style not in TextType:
-                    raise ValueError(
-                        f"TextNode type {
-                            node.styles} is not a valid TextType"
-                    )
+            # Ensure 'type' matches a valid TextType,
+            # interned style sets only hold valid ones
+            if node.styles not in STYLE_SETS:
+                for style in node.styles:
+                    if style not in TextType:
+                        raise ValueError(
+                            f"TextNode type {
+                                node.styles} is not a valid TextType"
+                        )
 
             # If the node is of a type that requires a URL, check for its existence/validity
-            if node.styles in [{TextType.IMAGE}, {TextType.LINK}]:
+            if node.styles in URL_STYLES:
                 if not isinstance(node.url, str) or not node.url:
                     raise ValueError(
                         f"TextNode of type {
@@ -328,6 +338,20 @@ class MarkdownNodes(BaseNodes):
 
         return True
 
+    @classmethod
+    def validate_urls(cls, nodes):
+        """
+        Check that image and link nodes have an url, the only check of
+        validate_textnodes that depends on the parsed text
+        """
+        for node in nodes:
+            if node.styles in URL_STYLES and not node.url:
+                raise ValueError(
+                    f"TextNode of type {
+                        node.styles} must have a non-empty 'url' string. Found: {node.url}"
+                )
+        return True
+
     @classmethod
     def find_delimiters_first_position(cls, text):
         """
@@ -498,47 +522,51 @@ class MarkdownNodes(BaseNodes):
     @classmethod
     def apply_style(cls, delimiter, current_styles, new_style=None):
         """
-        Apply style following conditions
+        Apply style following conditions, return an interned style set
         """
         # Text between delimiters - combine styles
         if delimiter == "`":
-            between_styles = {TextType.CODE}
-        elif delimiter == "***" and current_styles != {TextType.CODE}:
-            between_styles = {TextType.BOLD, TextType.ITALIC}
+            between_styles = CODE_STYLES
+        elif delimiter == "***" and current_styles != CODE_STYLES:
+            between_styles = BOLD_ITALIC_STYLES
         else:
-            between_styles = current_styles.copy() if current_styles else set()
-            if new_style is not None and current_styles != {TextType.CODE}:
-                between_styles.add(new_style)
+            between_styles = intern_styles(current_styles)
+            if new_style is not None and current_styles != CODE_STYLES:
+                between_styles = add_style(between_styles, new_style)
         return between_styles
 
+    @classmethod
+    def split_on_matches(cls, text, pattern, style):
+        """
+        Create the TextNode list of text, where each match of an image
+        or link pattern becomes a node of the given style and the text
+        between matches, sliced by position, stays normal
+        """
+        split_nodes = []
+        position = 0
+        for match in pattern.finditer(text):
+            if match.start() > position:
+                split_nodes.append(
+                    TextNode(text[position: match.start()], NORMAL_STYLES)
+                )
+            content, url = match.groups()
+            split_nodes.append(TextNode(content, SINGLE_STYLES[style], url))
+            position = match.end()
+
+        if position < len(text):
+            split_nodes.append(TextNode(text[position:], NORMAL_STYLES))
+        return split_nodes
+
     @classmethod
     def extract_markdown_images(cls, text):
         """
         Use a regex ro return a list of tuple ("alt_text", "url")
         """
-        #    IMAGE_PATTERN = r"""
-        #    !                  # literal exclamation mark
-        #    \[                 # literal opening bracket
-        #    ([^\[\]]*)         # first capture group (alt text)
-        #    \]                 # literal closing bracket
-        #    \(                 # literal opening paren
-        #    ([^\(\)]*)         # second capture group (url)
-        #    \)                 # literal closing paren
-        #    """
-        return re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+        return IMAGE_PATTERN.findall(text)
 
     @classmethod
     def extract_markdown_links(cls, text):
         """
         Use a regex to return a list of tuple ("anchor_text", "url")
         """
-        #    LINK_PATTERN = r"""
-        #    (?<!!)             # negative lookbehind for !
-        #    \[                 # literal opening bracket
-        #    ([^\[\]]*)         # first capture group (link text)
-        #    \]                 # literal closing bracket
-        #    \(                 # literal opening paren
-        #    ([^\(\)]*)         # second capture group (url)
-        #    \)                 # literal closing paren
-        #    """
-        return re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+        return LINK_PATTERN.findall(text)
@@ -0,0 +1,187 @@
+"""
+This module holds the PageCache class, an on-disk cache of converted
+markdown bodies shared by every build using the same cache directory
+"""
+
+import hashlib
+import os
+import sqlite3
+
+from src.manifest import hash_content
+
+# Modules whose code decides the HTML of a converted markdown body
+CONVERTER_MODULES = (
+    "converter",
+    "htmlnode",
+    "inlinescanner",
+    "leafnode",
+    "markdownnode",
+    "parentnode",
+    "textnode",
+)
+
+
+def converter_fingerprint():
+    """
+    Return the sha256 hex digest of the source of the converter modules
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in CONVERTER_MODULES:
+        with open(os.path.join(src_dir, f"{name}.py"), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class PageCache:
+    """
+    sqlite cache mapping the hash of a markdown body to its HTML and title.
+    - path is the sqlite database file
+    - max_bytes bounds the total size of the cached HTML, the least
+    recently used entries are evicted when the cache is closed
+    - hits and misses count the lookups of the current build
+
+    The HTML is stored before the basepath rewrite, so the same entry
+    serves every basepath and every template. Keys include the fingerprint
+    of the converter code, so branches with different converters sharing
+    the cache never read each other's HTML.
+    """
+
+    FILE_NAME = "pages.sqlite3"
+
+    def __init__(self, path, max_bytes) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.fingerprint = converter_fingerprint()
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, html TEXT NOT NULL, title TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)"
+        )
+        # Use counter, incremented at each get or put, ordering the entries
+        self._clock = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM pages"
+        ).fetchone()[0]
+
+    def _tick(self):
+        """
+        Return the next value of the use counter
+        """
+        self._clock += 1
+        return self._clock
+
+    @classmethod
+    def open(cls, cache_dir, max_bytes):
+        """
+        Open the cache stored in cache_dir, creating it if needed.
+        Return None if it cannot be opened so the build runs without cache.
+        """
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            return cls(os.path.join(cache_dir, cls.FILE_NAME), max_bytes)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Ignoring page cache in {cache_dir}: {e}")
+            return None
+
+    def key(self, markdown_body):
+        """
+        Return the cache key of a markdown body
+        """
+        return hash_content(f"{self.fingerprint}\n{markdown_body}")
+
+    def get(self, key):
+        """
+        Return the (html, title) tuple cached for key, or None
+        """
+        try:
+            row = self._connection.execute(
+                "SELECT html, title FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._connection.execute(
+                    "UPDATE pages SET last_used = ? WHERE key = ?",
+                    (self._tick(), key),
+                )
+        except sqlite3.Error as e:
+            print(f"Error reading page cache {self.path}: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row
+
+    def missing(self, keys):
+        """
+        Return the set of keys without cached entry, counted as misses.
+        Only the keys are read, the HTML of the entries is read by get.
+        """
+        missing = set()
+        for key in set(keys):
+            try:
+                row = self._connection.execute(
+                    "SELECT 1 FROM pages WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Error reading page cache {self.path}: {e}")
+                row = None
+            if row is None:
+                missing.add(key)
+        self.misses += len(missing)
+        return missing
+
+    def put(self, key, html, title):
+        """
+        Store the html and title of a converted markdown body
+        """
+        try:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (key, html, title, len(html), self._tick()),
+            )
+        except sqlite3.Error as e:
+            print(f"Error writing page cache {self.path}: {e}")
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cached HTML
+        fits in max_bytes
+        """
+        try:
+            total = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._connection.execute(
+                "SELECT key, size FROM pages ORDER BY last_used"
+            )
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                total -= size
+            self._connection.executemany(
+                "DELETE FROM pages WHERE key = ?", evicted)
+        except sqlite3.Error as e:
+            print(f"Error evicting page cache {self.path}: {e}")
+
+    def close(self):
+        """
+        Evict old entries, save the cache and close it
+        """
+        self.evict()
+        try:
+            self._connection.commit()
+        except sqlite3.Error as e:
+            print(f"Error saving page cache {self.path}: {e}")
+        finally:
+            self._connection.close()
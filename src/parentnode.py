@@ -10,16 +10,40 @@ class ParentNode(HTMLNode):
     ParentNode class is a child from HTMLNode class
     """
 
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None) -> None:
         super().__init__(tag, None, children, props)
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
+        """
+        Yield the opening tag, the HTML of each descendant and the closing tag.
+        Nested ParentNode are walked with an explicit stack so deep trees
+        neither build intermediate strings nor hit the recursion limit.
+        """
+        yield self.opening_tag()
+        stack = [(self, iter(self.children))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    yield child.opening_tag()
+                    stack.append((child, iter(child.children)))
+                    break
+                yield from child.iter_html()
+            else:
+                stack.pop()
+                yield f"</{node.tag}>"
+
+    def opening_tag(self):
+        """
+        Validate the node and return its opening tag
+        """
         if self.tag is None:
             raise ValueError("ParentNode must have a tag")
         if not self.children:
             raise ValueError("ParentNode must have at least one child")
-        return (
-            f"<{self.tag}{self.props_to_html()}>"
-            f"{''.join(map(lambda x: x.to_html(), self.children))
-               }</{self.tag}>"
-        )
+        return f"<{self.tag}{self.props_to_html()}>"
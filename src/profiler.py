@@ -0,0 +1,108 @@
+"""
+This module holds the BuildProfile class, recording where the time
+of a build goes, stage by stage and page by page
+"""
+
+import json
+import threading
+import time
+
+# Number of pages listed by the report, slowest first
+SLOWEST_PAGES = 10
+
+
+class BuildProfile:
+    """
+    Time spent by a build in each stage and on each page.
+    - stages maps each name of STAGES to its cumulative time in seconds.
+    Writes run in several threads, their time can exceed the wall time.
+    - pages maps a source path to a (seconds, size) tuple, seconds being
+    the time spent converting and rendering the page and size the length
+    of its markdown
+
+    Stages are the discovery of the pages, reading the markdown, splitting
+    and typing the blocks, parsing the inline text, rendering the HTML of
+    the body, filling the template and writing the output.
+    """
+
+    STAGES = ("discover", "read", "blocks",
+              "inline", "html", "template", "write")
+
+    def __init__(self) -> None:
+        self.stages = dict.fromkeys(self.STAGES, 0.0)
+        self.pages = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        """
+        Add seconds to the cumulative time of a stage
+        """
+        with self._lock:
+            self.stages[stage] += seconds
+
+    def timed(self, stage, function, *args):
+        """
+        Call function with args and add its duration to stage
+        """
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add_page(self, source_key, seconds, size):
+        """
+        Record the conversion time of a page
+        """
+        self.pages[source_key] = (seconds, size)
+
+    def slowest_pages(self, count=SLOWEST_PAGES):
+        """
+        Return the (source_key, (seconds, size)) items of the slowest pages
+        """
+        ranked = sorted(self.pages.items(),
+                        key=lambda item: item[1][0], reverse=True)
+        return ranked[:count]
+
+    def report(self, count=SLOWEST_PAGES):
+        """
+        Return the summary table of the stages and the slowest pages
+        """
+        total = sum(self.stages.values())
+        lines = [f"{'Stage':<10} {'Seconds':>9} {'Share':>6}"]
+        for stage, seconds in self.stages.items():
+            share = seconds / total if total else 0
+            lines.append(f"{stage:<10} {seconds:>9.4f} {share:>6.1%}")
+        lines.append(f"{'total':<10} {total:>9.4f}")
+
+        slowest = self.slowest_pages(count)
+        if slowest:
+            lines.append("")
+            lines.append(f"{'Seconds':>9} {'Size':>8}  Slowest pages")
+            for source_key, (seconds, size) in slowest:
+                lines.append(f"{seconds:>9.4f} {size:>8}  {source_key}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        """
+        Return the profile as a JSON serializable dictionnary
+        """
+        return {
+            "stages": self.stages,
+            "pages": {
+                source_key: {"seconds": seconds, "size": size}
+                for source_key, (seconds, size) in self.pages.items()
+            },
+        }
+
+    def save_json(self, path):
+        """
+        Write the profile to path as JSON, return True on success
+        """
+        try:
+            with open(path, "w", encoding="UTF-8") as f:
+                json.dump(self.to_dict(), f, indent=1, sort_keys=True)
+            return True
+        except OSError as e:
+            print(f"Error writing build profile {path}: {e}")
+            return False
@@ -0,0 +1,83 @@
+"""
+This module holds the Template class, a page template compiled once
+into literal segments and named slots, and the basepath rewrite helper
+"""
+
+import re
+
+from src.htmlnode import HTMLNode
+
+# Matches a slot such as {{ Title }} and captures its name
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Attribute openings whose root-relative value must be prefixed with basepath
+URL_ATTRIBUTES = ('href="', 'src="')
+
+
+def rewrite_basepath(html, basepath):
+    """
+    Prefix root-relative href and src attributes with basepath
+    """
+    if basepath == "/":
+        return html
+    for attribute in URL_ATTRIBUTES:
+        html = html.replace(f"{attribute}/", f"{attribute}{basepath}")
+    return html
+
+
+class Template:
+    """
+    Page template compiled into a list of literal segments and slots.
+    - literals are the text between slots, with the basepath rewrite
+    already applied, there is always one more literal than slots
+    - slots are the slot names, in order of appearance
+    - raw_slots are the slot texts as written in the source, rendered
+    unchanged when no value is given for a slot
+    - url_slots tells for each slot if it is the value of a href or src
+    attribute, in which case a root-relative value is prefixed with basepath
+    """
+
+    def __init__(self, source, basepath="/") -> None:
+        self.basepath = basepath
+        self.literals = []
+        self.slots = []
+        self.raw_slots = []
+        self.url_slots = []
+
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            literal = source[position: match.start()]
+            self.literals.append(rewrite_basepath(literal, basepath))
+            self.slots.append(match.group(1))
+            self.raw_slots.append(rewrite_basepath(match.group(0), basepath))
+            self.url_slots.append(literal.endswith(URL_ATTRIBUTES))
+            position = match.end()
+        self.literals.append(rewrite_basepath(source[position:], basepath))
+
+    def iter_chunks(self, values):
+        """
+        Yield the chunks of the rendered template.
+        values maps slot names to either a string or an HTMLNode,
+        which is streamed with its iter_html method.
+        """
+        yield self.literals[0]
+        for name, raw_slot, is_url, literal in zip(
+            self.slots, self.raw_slots, self.url_slots, self.literals[1:]
+        ):
+            value = values.get(name)
+            if value is None:
+                yield raw_slot
+            elif isinstance(value, HTMLNode):
+                for chunk in value.iter_html():
+                    yield rewrite_basepath(chunk, self.basepath)
+            else:
+                if is_url and value.startswith("/"):
+                    value = self.basepath + value[1:]
+                yield rewrite_basepath(value, self.basepath)
+            yield literal
+
+    def render(self, values):
+        """
+        Return the rendered template as a single string
+        """
+        return "".join(self.iter_chunks(values))
@@ -20,26 +20,81 @@ class TextType(Enum):
     IMAGE = "image"
 
 
+def _all_style_combinations():
+    """
+    Return a dictionnary mapping every combination of TextType
+    to a single shared frozenset instance
+    """
+    combinations = [frozenset()]
+    for text_type in TextType:
+        combinations += [combination | {text_type}
+                         for combination in combinations]
+    return {combination: combination for combination in combinations}
+
+
+# Interned style sets, one frozenset instance per combination of TextType
+STYLE_SETS = _all_style_combinations()
+
+# Interned sets with a single style, e.g. SINGLE_STYLES[TextType.BOLD]
+SINGLE_STYLES = {
+    text_type: STYLE_SETS[frozenset((text_type,))] for text_type in TextType
+}
+NO_STYLES = STYLE_SETS[frozenset()]
+NORMAL_STYLES = SINGLE_STYLES[TextType.NORMAL]
+CODE_STYLES = SINGLE_STYLES[TextType.CODE]
+BOLD_ITALIC_STYLES = STYLE_SETS[frozenset((TextType.BOLD, TextType.ITALIC))]
+
+# Interned result of adding one style to an interned set
+_ADDED_STYLES = {
+    (styles, text_type): STYLE_SETS[styles | {text_type}]
+    for styles in STYLE_SETS
+    for text_type in TextType
+}
+
+# Style used to render each interned set, the one TextNode.__repr__ shows
+PRIMARY_STYLES = {styles: next(iter(styles))
+                  for styles in STYLE_SETS if styles}
+
+
+def intern_styles(styles):
+    """
+    Return the shared frozenset equal to styles, styles being a set,
+    a frozenset, a single TextType or None.
+    Unknown styles are kept in a frozenset that is not shared.
+    """
+    if styles is None:
+        return STYLE_SETS[frozenset()]
+    if isinstance(styles, TextType):
+        styles = frozenset((styles,))
+    elif not isinstance(styles, frozenset):
+        styles = frozenset(styles)
+    return STYLE_SETS.get(styles, styles)
+
+
+def add_style(styles, text_type):
+    """
+    Return the interned set of styles with text_type added,
+    without allocating a new set
+    """
+    added = _ADDED_STYLES.get((styles, text_type))
+    if added is None:
+        return intern_styles(set(styles) | {text_type})
+    return added
+
+
 class TextNode:
     """
-    Class to handle TextNode
+    Class to handle TextNode.
+    Instances have no __dict__ and styles are stored as an interned
+    frozenset, shared by every node with the same styles.
     """
 
+    __slots__ = ("content", "_styles", "url")
+
     def __init__(self, content, styles, url=None) -> None:
-        self._content = content
+        self.content = content
         self.styles = styles
-        self._url = url
-
-    @property
-    def content(self):
-        """
-        Getter for content member
-        """
-        return self._content
-
-    @content.setter
-    def content(self, content):
-        self._content = content
+        self.url = url
 
     @property
     def styles(self):
@@ -50,24 +105,7 @@ class TextNode:
 
     @styles.setter
     def styles(self, styles):
-        if isinstance(styles, set):
-            self._styles = styles
-        elif styles is None:
-            self._styles = set()
-        else:
-            # If it's a single TextType, create a set with just that type
-            self._styles = {styles}
-
-    @property
-    def url(self):
-        """
-        Getter for url member
-        """
-        return self._url
-
-    @url.setter
-    def url(self, url):
-        self._url = url
+        self._styles = intern_styles(styles)
 
     def __eq__(self, other):
         return (
@@ -78,5 +116,5 @@ class TextNode:
 
     def __repr__(self):
         # Get style_type from the set
-        style = next(iter(self._styles))
+        style = PRIMARY_STYLES.get(self._styles) or next(iter(self._styles))
         return f"TextNode({self.content}, {style.value}, {self.url})"
@@ -0,0 +1,275 @@
+"""
+This module holds the Watcher class, reporting the files changed under
+a set of watched paths, used by the watch mode of main.py
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# inotify event masks, see inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Watcher:
+    """
+    Report the files created, modified or deleted under watched paths.
+    - paths are files or directories, directories are watched recursively
+    - interval is the delay in seconds between two scans when polling
+    - debounce is the quiet delay in seconds closing a burst of changes,
+    so an editor saving several files triggers a single rebuild
+
+    inotify is used on Linux, other platforms poll the modification
+    time and size of every watched file.
+    """
+
+    def __init__(
+        self, paths, interval=0.5, debounce=0.2, use_inotify=True
+    ) -> None:
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self.debounce = debounce
+        self._fd = None
+        self._add_watch_function = None
+        self._watches = {}
+        self._snapshot = {}
+        if use_inotify and sys.platform.startswith("linux"):
+            self._start_inotify()
+        if self._fd is None:
+            self._snapshot = self._scan()
+
+    @property
+    def uses_inotify(self):
+        """
+        True if changes are reported by inotify instead of polling
+        """
+        return self._fd is not None
+
+    def wait_for_changes(self, timeout=None):
+        """
+        Wait until watched files change and return the set of their paths,
+        once no other change happened for the debounce delay.
+        Return an empty set if nothing changed before timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changes = set()
+        # Events about unwatched files next to a watched one give no change
+        while not changes:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return changes
+            changes = self._next_changes(remaining)
+        while changes:
+            more_changes = self._next_changes(self.debounce)
+            if not more_changes:
+                break
+            changes |= more_changes
+        return changes
+
+    def close(self):
+        """
+        Release the inotify file descriptor
+        """
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _is_watched(self, path):
+        """
+        Return True if path is a watched file or under a watched directory
+        """
+        return any(
+            path == root or path.startswith(root + os.sep)
+            for root in self.paths
+        )
+
+    def _next_changes(self, timeout):
+        """
+        Return the changes reported before timeout seconds, waiting
+        forever if timeout is None
+        """
+        if self._fd is not None:
+            return self._read_inotify(timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changes = self._poll()
+            if changes:
+                return changes
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def _scan(self):
+        """
+        Return a dictionnary mapping each watched file to its
+        modification time and size
+        """
+        snapshot = {}
+        stack = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                stack.append(path)
+            elif os.path.isfile(path):
+                stat = os.stat(path)
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            snapshot[entry.path] = (
+                                stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def _poll(self):
+        """
+        Scan the watched paths and return the files that changed
+        since the previous scan
+        """
+        snapshot = self._scan()
+        changes = {
+            path
+            for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        return changes
+
+    def _start_inotify(self):
+        """
+        Open an inotify instance watching every watched directory,
+        and the parent directory of watched files. Keep polling if
+        inotify cannot be used.
+        """
+        library = ctypes.util.find_library("c")
+        if library is None:
+            return
+        try:
+            libc = ctypes.CDLL(library, use_errno=True)
+            self._add_watch_function = libc.inotify_add_watch
+            fd = libc.inotify_init1(IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+
+        self._fd = fd
+        for path in self.paths:
+            if os.path.isdir(path):
+                self._add_watch_tree(path)
+            else:
+                self._add_watch(os.path.dirname(path))
+
+    def _add_watch(self, dir_path):
+        """
+        Watch a single directory
+        """
+        wd = self._add_watch_function(
+            self._fd, os.fsencode(dir_path), WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = dir_path
+
+    def _add_watch_tree(self, dir_path):
+        """
+        Watch a directory and all its subdirectories
+        """
+        for current_dir, _, _ in os.walk(dir_path):
+            self._add_watch(current_dir)
+
+    def _read_inotify(self, timeout):
+        """
+        Read the pending inotify events and return the watched paths
+        they concern, waiting at most timeout seconds for a first event
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        data = os.read(self._fd, 64 * 1024)
+        changes = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset: offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, report every watched path
+                changes.update(self.paths)
+                continue
+            dir_path = self._watches.get(wd)
+            if dir_path is None:
+                continue
+            if mask & IN_IGNORED:  # Watched directory removed
+                del self._watches[wd]
+                continue
+            path = dir_path
+            if name:
+                path = os.path.join(dir_path, os.fsdecode(name))
+            if not self._is_watched(path):
+                # Next to a watched file, such as a directory created by the
+                # build
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                changes.update(self._watch_new_directory(path))
+            changes.add(path)
+        return changes
+
+    def _watch_new_directory(self, dir_path):
+        """
+        Watch a new directory and return the watched files already in it,
+        as files may be written before the watch is added
+        """
+        self._add_watch_tree(dir_path)
+        files = set()
+        for current_dir, _, file_names in os.walk(dir_path):
+            files.update(
+                path
+                for path in (
+                    os.path.join(current_dir, file_name)
+                    for file_name in file_names
+                )
+                if self._is_watched(path)
+            )
+        return files
@@ -6,10 +6,14 @@ import unittest
 
 from src.converter import (
     BlockType,
+    block_cache_info,
     block_to_block_type,
+    configure,
     extract_title,
+    iter_markdown_blocks,
     markdown_to_blocks,
     markdown_to_html_node,
+    split_front_matter,
     text_node_to_html,
 )
 from src.leafnode import LeafNode
@@ -167,6 +171,47 @@ class TestMarkdownToBlocks(unittest.TestCase):
 
         self.assertEqual((markdown_to_blocks(markdown)), expected)
 
+    def test_many_blocks(self):
+        """
+        Check against a document longer than the recursion limit
+        """
+        markdown = "\n\n".join(f"Paragraph {i}" for i in range(5000))
+        blocks = markdown_to_blocks(markdown)
+        self.assertEqual(len(blocks), 5000)
+        self.assertEqual(blocks[-1], "Paragraph 4999")
+
+
+class TestIterMarkdownBlocks(unittest.TestCase):
+    """
+    Test class for iter_markdown_blocks function
+    """
+
+    def test_line_numbers(self):
+        """
+        Check against the source line reported for each block
+        """
+        markdown = "# Title\n\nFirst line\nSecond line\n\n\n\n   - item"
+        expected = [
+            (1, "# Title"),
+            (3, "First line\nSecond line"),
+            (8, "- item"),
+        ]
+        self.assertEqual(list(iter_markdown_blocks(markdown)), expected)
+
+    def test_leading_blank_lines(self):
+        """
+        Check against blank lines before the first block
+        """
+        markdown = "\n\n\nParagraph"
+        self.assertEqual(list(iter_markdown_blocks(markdown)),
+                         [(4, "Paragraph")])
+
+    def test_whitespace_only(self):
+        """
+        Check against a text without any block
+        """
+        self.assertEqual(list(iter_markdown_blocks("  \n\n \n\n")), [])
+
 
 class TestBlockToBlockType(unittest.TestCase):
     """
@@ -389,6 +434,95 @@ class TestMarkdownToHTML(unittest.TestCase):
         # Assert equality
         self.assertEqual(result_html, expected_html)
 
+    def test_ordered_list_and_code(self):
+        """
+        Check against ordered list and code blocks
+        """
+        markdown = "1. First\n2. Second\n\n```\nprint('hi')\n```"
+        expected_html = (
+            "<div>"
+            "<ol><li>First</li><li>Second</li></ol>"
+            "<pre><code>print('hi')</code></pre>"
+            "</div>"
+        )
+        self.assertEqual(
+            markdown_to_html_node(markdown).to_html(), expected_html)
+
+    def test_many_blocks(self):
+        """
+        Check against a document longer than the recursion limit
+        """
+        markdown = "\n\n".join(f"Paragraph {i}" for i in range(5000))
+        node = markdown_to_html_node(markdown)
+        self.assertEqual(len(node.children), 5000)
+        self.assertEqual(node.children[-1].to_html(), "<p>Paragraph 4999</p>")
+
+    def test_scanner_inline_parser(self):
+        """
+        Check against the pipeline with the single-pass inline parser
+        """
+        markdown = (
+            "# Title\n\n- [link](/a) and **bold**\n- `code`\n\nSome *text*.")
+        expected_html = markdown_to_html_node(markdown).to_html()
+        previous = configure(inline_parser="scanner")
+        try:
+            self.assertEqual(markdown_to_html_node(
+                markdown).to_html(), expected_html)
+        finally:
+            configure(**previous)
+
+    def test_without_validation(self):
+        """
+        Check against the validated conversion with validation skipped
+        """
+        markdown = (
+            "# Title\n\n- [link](/a) and **bold**\n- `code`\n\nSome *text*.")
+        expected_html = markdown_to_html_node(markdown).to_html()
+        previous = configure(validate_textnodes=False)
+        try:
+            self.assertEqual(markdown_to_html_node(
+                markdown).to_html(), expected_html)
+        finally:
+            configure(**previous)
+
+    def test_block_cache(self):
+        """
+        Check against repeated blocks converted with the block cache
+        """
+        markdown = (
+            "# Title\n\n- [Back to top](#top)\n\nText\n\n"
+            "- [Back to top](#top)"
+        )
+        expected_html = markdown_to_html_node(markdown).to_html()
+        self.assertIsNone(block_cache_info())
+        previous = configure(block_cache_size=8)
+        try:
+            node = markdown_to_html_node(markdown)
+            self.assertEqual(node.to_html(), expected_html)
+            self.assertIs(node.children[1], node.children[3])
+            info = block_cache_info()
+            self.assertEqual(
+                (info.hits, info.misses, info.currsize), (1, 3, 3))
+        finally:
+            configure(**previous)
+        self.assertIsNone(block_cache_info())
+
+    def test_invalid_block_cache_size(self):
+        """
+        Check against a negative block cache size
+        """
+        with self.assertRaises(ValueError):
+            configure(block_cache_size=-1)
+
+    def test_unknown_setting(self):
+        """
+        Check against invalid conversion settings
+        """
+        with self.assertRaises(ValueError):
+            configure(inline_parser="unknown")
+        with self.assertRaises(ValueError):
+            configure(unknown=True)
+
 
 class ExtractTitle(unittest.TestCase):
     """
@@ -440,5 +574,60 @@ class ExtractTitle(unittest.TestCase):
             extract_title(text)
 
 
+class TestSplitFrontMatter(unittest.TestCase):
+    """
+    Test class for split_front_matter function
+    """
+
+    def test_no_front_matter(self):
+        """
+        Check against a document without front matter
+        """
+        markdown = "# Title\n\nBody"
+        self.assertEqual(split_front_matter(markdown), ({}, markdown))
+
+    def test_front_matter(self):
+        """
+        Check against a document starting with front matter
+        """
+        markdown = "---\nDate: 2024-01-01\nAuthor: Me: Myself\n---\n# Title"
+        self.assertEqual(
+            split_front_matter(markdown),
+            ({"Date": "2024-01-01", "Author": "Me: Myself"}, "# Title"),
+        )
+
+    def test_unterminated_front_matter(self):
+        """
+        Check against a front matter without closing line
+        """
+        markdown = "---\nDate: 2024-01-01\n# Title"
+        self.assertEqual(split_front_matter(markdown), ({}, markdown))
+
+    def test_front_matter_closing_line(self):
+        """
+        Check against lines starting with --- that do not close the front
+        matter
+        """
+        markdown = "---\nTitle: T\n----\n---foo\n---\n# Title\n---"
+        self.assertEqual(
+            split_front_matter(markdown),
+            ({"Title": "T"}, "# Title\n---"),
+        )
+
+    def test_front_matter_closing_line_missing(self):
+        """
+        Check against a document starting with a --- line and no closing line
+        """
+        markdown = "---\nSome text\n-----\n\n# Title"
+        self.assertEqual(split_front_matter(markdown), ({}, markdown))
+
+    def test_front_matter_closing_last_line(self):
+        """
+        Check against a closing line ending the document
+        """
+        self.assertEqual(
+            split_front_matter("---\nA: b\n---"), ({"A": "b"}, ""))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,260 @@
+"""
+Test module for devserver.py
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src import devserver
+from src.devserver import EVENTS_PATH, RELOAD_SCRIPT, DevServer
+from src.generator import _render_page
+
+
+def _write(path, content):
+    """
+    Write content to the text file at path
+    """
+    with open(path, "w", encoding="UTF-8") as f:
+        f.write(content)
+
+
+async def _request(port, path, method="GET"):
+    """
+    Send an HTTP request to the server listening on port and return
+    the response
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    return response.decode()
+
+
+class TestDevServer(unittest.TestCase):
+    """
+    This class test DevServer, resolving, rendering and serving pages
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.test_dir, "content")
+        self.static_dir = os.path.join(self.test_dir, "static")
+        os.makedirs(os.path.join(self.content_dir, "blog", "post"))
+        os.makedirs(os.path.join(self.static_dir, "images"))
+        self.index_path = os.path.join(self.content_dir, "index.md")
+        self.post_path = os.path.join(
+            self.content_dir, "blog", "post", "index.md")
+        self.template_path = os.path.join(self.test_dir, "template.html")
+        _write(self.index_path, "# Home\n\nWelcome")
+        _write(self.post_path, "# Post\n\nA post")
+        _write(
+            self.template_path,
+            "<html><title>{{ Title }}</title>"
+            "<body>{{ Content }}</body></html>",
+        )
+        _write(os.path.join(self.static_dir, "index.css"), "body {}")
+        self.server = DevServer(
+            self.content_dir, self.template_path, self.static_dir)
+
+    def tearDown(self):
+        """
+        Clean up temporary directory
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_resolve(self):
+        """
+        Check against URL paths of pages, static files and missing files
+        """
+        server = self.server
+        self.assertEqual(server.resolve("/"), ("page", self.index_path))
+        self.assertEqual(server.resolve("/blog/post/"),
+                         ("page", self.post_path))
+        self.assertEqual(server.resolve("/blog/post"),
+                         ("page", self.post_path))
+        self.assertEqual(
+            server.resolve("/index.css"),
+            ("static", os.path.join(self.static_dir, "index.css")),
+        )
+        self.assertIsNone(server.resolve("/blog/"))
+        self.assertIsNone(server.resolve("/images/"))
+        self.assertIsNone(server.resolve("/../template.html"))
+
+    def test_render(self):
+        """
+        Check against a rendered page with the reload script
+        """
+        html = self.server.render(self.post_path)
+        self.assertEqual(
+            html,
+            "<html><title>Post</title>"
+            "<body><div><h1>Post</h1><p>A post</p></div>"
+            f"{RELOAD_SCRIPT}</body></html>",
+        )
+        self.assertIn(self.post_path, self.server.pages)
+
+    def test_render_section_template(self):
+        """
+        Check against a page rendered with the template of its section
+        """
+        _write(
+            os.path.join(self.content_dir, "blog", "template.html"),
+            "<body>Blog: {{ Title }}</body>",
+        )
+        self.assertEqual(
+            self.server.render(self.post_path),
+            f"<body>Blog: Post{RELOAD_SCRIPT}</body>",
+        )
+        self.assertIn("<h1>Home</h1>", self.server.render(self.index_path))
+
+    def test_invalidate(self):
+        """
+        Check against a markdown change dropping only its page, a static
+        change dropping no page and a template change dropping its pages
+        """
+        self.server.render(self.index_path)
+        self.server.render(self.post_path)
+        _write(self.post_path, "# Edited")
+
+        self.server.invalidate({self.post_path})
+        self.assertEqual(list(self.server.pages), [self.index_path])
+        self.assertIn("Edited", self.server.render(self.post_path))
+
+        self.server.invalidate({os.path.join(self.static_dir, "index.css")})
+        self.assertEqual(len(self.server.pages), 2)
+
+        _write(self.template_path, "<body>{{ Title }}</body>")
+        self.server.invalidate({self.template_path})
+        self.assertEqual(self.server.pages, {})
+        self.assertEqual(
+            self.server.render(self.index_path),
+            f"<body>Home{RELOAD_SCRIPT}</body>",
+        )
+
+    def test_invalidate_section_template(self):
+        """
+        Check against a new section template dropping only the pages
+        of its section
+        """
+        self.server.render(self.index_path)
+        self.server.render(self.post_path)
+        section_template = os.path.join(
+            self.content_dir, "blog", "template.html")
+        _write(section_template, "<body>Blog: {{ Title }}</body>")
+
+        self.server.invalidate({section_template})
+        self.assertEqual(list(self.server.pages), [self.index_path])
+        self.assertEqual(
+            self.server.render(self.post_path),
+            f"<body>Blog: Post{RELOAD_SCRIPT}</body>",
+        )
+        self.assertEqual(
+            self.server.dependencies[self.post_path],
+            {self.post_path, section_template},
+        )
+
+        _write(section_template, "<body>News: {{ Title }}</body>")
+        self.server.invalidate({section_template})
+        self.assertEqual(list(self.server.pages), [self.index_path])
+        self.assertIn("News: Post", self.server.render(self.post_path))
+
+    def test_invalidate_during_render(self):
+        """
+        Check against a template change while a page is converted,
+        the page rendered with the old template is not kept
+        """
+        def render_during_change(markdown_content, template):
+            _write(self.template_path, "<body>{{ Title }}</body>")
+            self.server.invalidate({self.template_path})
+            return _render_page(markdown_content, template)
+
+        with mock.patch.object(
+            devserver, "_render_page", side_effect=render_during_change
+        ):
+            self.assertIn("<title>Home</title>",
+                          self.server.render(self.index_path))
+        self.assertEqual(self.server.pages, {})
+        self.assertEqual(
+            self.server.render(self.index_path),
+            f"<body>Home{RELOAD_SCRIPT}</body>",
+        )
+
+    def test_http(self):
+        """
+        Check against HTTP responses for a page, a static file,
+        a missing file, a broken page and a reload event
+        """
+        _write(os.path.join(self.content_dir, "broken.md"), "no title")
+
+        async def scenario():
+            server = await asyncio.start_server(
+                self.server.handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                page = await _request(port, "/blog/post/")
+                css = await _request(port, "/index.css")
+                missing = await _request(port, "/missing")
+                broken = await _request(port, "/broken.html")
+
+                reader, writer = await asyncio.open_connection(
+                    "127.0.0.1", port)
+                writer.write(f"GET {EVENTS_PATH} HTTP/1.1\r\n\r\n".encode())
+                headers = await reader.readuntil(b"\r\n\r\n")
+                self.server.notify_reload()
+                event = await asyncio.wait_for(reader.readuntil(b"\n\n"), 1)
+                writer.close()
+            return page, css, missing, broken, headers.decode(), event.decode()
+
+        page, css, missing, broken, headers, event = asyncio.run(scenario())
+        self.assertTrue(page.startswith("HTTP/1.1 200 OK\r\n"))
+        self.assertIn("Content-Type: text/html; charset=utf-8", page)
+        self.assertIn("<h1>Post</h1>", page)
+        self.assertTrue(css.startswith("HTTP/1.1 200 OK\r\n"))
+        self.assertIn("Content-Type: text/css", css)
+        self.assertTrue(css.endswith("\r\n\r\nbody {}"))
+        self.assertTrue(missing.startswith("HTTP/1.1 404 Not Found\r\n"))
+        self.assertTrue(broken.startswith("HTTP/1.1 500 Error\r\n"))
+        self.assertIn("Content-Type: text/event-stream", headers)
+        self.assertEqual(event, "data: reload\n\n")
+
+    def test_http_errors(self):
+        """
+        Check against a static file removed or unreadable after it was
+        resolved, and a broken page requested with HEAD
+        """
+        _write(os.path.join(self.content_dir, "broken.md"), "no title")
+        css_path = os.path.join(self.static_dir, "index.css")
+
+        async def scenario():
+            server = await asyncio.start_server(
+                self.server.handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                with mock.patch.object(
+                    devserver, "_read_bytes",
+                    side_effect=PermissionError("denied"),
+                ):
+                    unreadable = await _request(port, "/index.css")
+                os.remove(css_path)
+                with mock.patch.object(
+                    self.server, "resolve", return_value=("static", css_path)
+                ):
+                    removed = await _request(port, "/index.css")
+                broken = await _request(port, "/broken.html", "HEAD")
+            return unreadable, removed, broken
+
+        unreadable, removed, broken = asyncio.run(scenario())
+        self.assertTrue(unreadable.startswith("HTTP/1.1 500 Error\r\n"))
+        self.assertIn("denied", unreadable)
+        self.assertTrue(removed.startswith("HTTP/1.1 404 Not Found\r\n"))
+        self.assertTrue(broken.startswith("HTTP/1.1 500 Error\r\n"))
+        self.assertTrue(broken.endswith("\r\n\r\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
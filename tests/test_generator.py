@@ -2,12 +2,49 @@
 Test module for generator.py
 """
 
+import errno
 import os
 import shutil
 import tempfile
 import unittest
 
-from src.generator import generate_pages_recursive
+from unittest import mock
+
+from src import generator
+from src.generator import (
+    BuildContext,
+    BuildOptions,
+    PageJob,
+    StaticCopier,
+    _discover_pages,
+    _read_file_safely,
+    _write_file_safely,
+    changed_sources,
+    generate_pages_recursive,
+    sync_static,
+)
+from src.manifest import BuildManifest
+from src.pagecache import PageCache
+from src.profiler import BuildProfile
+
+
+def _write(path, content):
+    """
+    Write content to the text file at path
+    """
+    with open(path, "w", encoding="UTF-8") as f:
+        f.write(content)
+
+
+class TempDirTestCase(unittest.TestCase):
+    """
+    Base class of the tests working in a temporary directory,
+    removed after each test
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
 
 
 class TestGeneratePagesRecursive(unittest.TestCase):
@@ -129,6 +166,875 @@ class TestGeneratePagesRecursive(unittest.TestCase):
         self.assertFalse(os.path.exists(
             os.path.join(self.output_dir, "readme.html")))
 
+    def test_basepath_rewrite(self):
+        """
+        Check against links and images prefixed with the basepath
+        """
+        with open(
+            os.path.join(self.content_dir, "test.md"), "w", encoding="UTF-8"
+        ) as f:
+            f.write("# Test Title\n\n[home](/index) ![logo](/logo.png)")
+
+        generate_pages_recursive(
+            self.content_dir, self.template_path, self.output_dir, "/site/"
+        )
+
+        with open(
+            os.path.join(self.output_dir, "test.html"), "r", encoding="UTF-8"
+        ) as f:
+            content = f.read()
+        self.assertIn('<a href="/site/index">home</a>', content)
+        self.assertIn('<img src="/site/logo.png" alt="logo">', content)
+
+    def test_front_matter_slots(self):
+        """
+        Check against template slots filled from the page front matter
+        """
+        with open(self.template_path, "w", encoding="UTF-8") as f:
+            f.write("<h1>{{ Title }}</h1><time>{{ Date }}</time>{{ Content }}")
+        with open(
+            os.path.join(self.content_dir, "test.md"), "w", encoding="UTF-8"
+        ) as f:
+            f.write("---\nDate: 2024-05-01\n---\n# Test Title\n\nBody")
+
+        generate_pages_recursive(
+            self.content_dir, self.template_path, self.output_dir)
+
+        with open(
+            os.path.join(self.output_dir, "test.html"), "r", encoding="UTF-8"
+        ) as f:
+            self.assertEqual(
+                f.read(),
+                "<h1>Test Title</h1><time>2024-05-01</time>"
+                "<div><h1>Test Title</h1><p>Body</p></div>",
+            )
+
+    def test_parallel_matches_serial(self):
+        """
+        Check against a build with several worker processes
+        """
+        blog_dir = os.path.join(self.content_dir, "blog")
+        os.makedirs(blog_dir)
+        for i in range(6):
+            with open(
+                os.path.join(blog_dir, f"post{i}.md"), "w", encoding="UTF-8"
+            ) as f:
+                f.write(f"# Post {i}\n\nSome **bold** [link](/blog/post{i})")
+
+        serial_dir = os.path.join(self.test_dir, "serial")
+        generate_pages_recursive(
+            self.content_dir, self.template_path, serial_dir, "/site/")
+        generate_pages_recursive(
+            self.content_dir, self.template_path, self.output_dir, "/site/",
+            BuildOptions(jobs=3),
+        )
+
+        for name in ["test.html"] + [f"blog/post{i}.html" for i in range(6)]:
+            with open(
+                os.path.join(serial_dir, name), "r", encoding="UTF-8"
+            ) as f:
+                expected = f.read()
+            with open(
+                os.path.join(self.output_dir, name), "r", encoding="UTF-8"
+            ) as f:
+                self.assertEqual(f.read(), expected)
+
+    def test_single_writer(self):
+        """
+        Check against a build writing pages with a single thread
+        """
+        for i in range(5):
+            with open(
+                os.path.join(self.content_dir, f"page{i}.md"), "w",
+                encoding="UTF-8",
+            ) as f:
+                f.write(f"# Page {i}")
+        generate_pages_recursive(
+            self.content_dir, self.template_path, self.output_dir,
+            options=BuildOptions(writers=1),
+        )
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)),
+            [f"page{i}.html" for i in range(5)] + ["test.html"],
+        )
+
+    def test_profile(self):
+        """
+        Check against a profiled build giving the same pages and
+        recording every stage and page
+        """
+        nested_dir = os.path.join(self.content_dir, "blog")
+        os.makedirs(nested_dir)
+        with open(
+            os.path.join(nested_dir, "post.md"), "w", encoding="UTF-8"
+        ) as f:
+            f.write("# Post\n\nSome *inline* text")
+        generate_pages_recursive(
+            self.content_dir, self.template_path, self.output_dir)
+        expected = {}
+        for name in ("test.html", "blog/post.html"):
+            with open(
+                os.path.join(self.output_dir, name), "r", encoding="UTF-8"
+            ) as f:
+                expected[name] = f.read()
+        shutil.rmtree(self.output_dir)
+
+        profile = BuildProfile()
+        generate_pages_recursive(
+            self.content_dir,
+            self.template_path,
+            self.output_dir,
+            options=BuildOptions(
+                jobs=2, cache_dir=os.path.join(self.test_dir, "cache"),
+                profile=profile,
+            ),
+        )
+        for name, html in expected.items():
+            with open(
+                os.path.join(self.output_dir, name), "r", encoding="UTF-8"
+            ) as f:
+                self.assertEqual(f.read(), html)
+        for stage in profile.STAGES:
+            self.assertGreater(profile.stages[stage], 0, stage)
+        self.assertEqual(
+            sorted(profile.pages), [os.path.join("blog", "post.md"), "test.md"]
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "cache")))
+
+    def test_template_read_once(self):
+        """
+        Check against the template being read once for many directories
+        """
+        for name in ("a", "b", "c"):
+            section_dir = os.path.join(self.content_dir, name)
+            os.makedirs(section_dir)
+            with open(
+                os.path.join(section_dir, "post.md"), "w", encoding="UTF-8"
+            ) as f:
+                f.write(f"# Post {name}")
+
+        with mock.patch(
+            "src.generator._read_file_safely", wraps=_read_file_safely
+        ) as read:
+            generate_pages_recursive(
+                self.content_dir, self.template_path, self.output_dir)
+
+        read_paths = [call.args[0] for call in read.call_args_list]
+        self.assertEqual(read_paths.count(self.template_path), 1)
+
+    def test_section_template(self):
+        """
+        Check against a template.html overriding the template of a section
+        """
+        blog_dir = os.path.join(self.content_dir, "blog")
+        nested_dir = os.path.join(blog_dir, "2024")
+        os.makedirs(nested_dir)
+        with open(
+            os.path.join(blog_dir, "template.html"), "w", encoding="UTF-8"
+        ) as f:
+            f.write("<blog>{{ Title }}</blog>")
+        for path in (blog_dir, nested_dir):
+            with open(
+                os.path.join(path, "post.md"), "w", encoding="UTF-8"
+            ) as f:
+                f.write("# Blog Post")
+
+        generate_pages_recursive(
+            self.content_dir, self.template_path, self.output_dir)
+
+        for name in ("blog/post.html", "blog/2024/post.html"):
+            with open(
+                os.path.join(self.output_dir, name), "r", encoding="UTF-8"
+            ) as f:
+                self.assertEqual(f.read(), "<blog>Blog Post</blog>")
+        with open(
+            os.path.join(self.output_dir, "test.html"), "r", encoding="UTF-8"
+        ) as f:
+            self.assertIn("<h1>Test Title</h1>", f.read())
+
+    def test_discover_pages(self):
+        """
+        Check against the flat list of page jobs of a nested content tree
+        """
+        blog_dir = os.path.join(self.content_dir, "blog")
+        os.makedirs(os.path.join(blog_dir, "2024"))
+        contents = {
+            "about.md": "# About",
+            "blog/template.html": "{{ Content }}",
+            "blog/post.md": "# Post",
+            "blog/2024/new.md": "# New",
+            "blog/notes.txt": "notes",
+            "zebra.md": "# Zebra",
+        }
+        for name, content in contents.items():
+            with open(
+                os.path.join(self.content_dir, name), "w", encoding="UTF-8"
+            ) as f:
+                f.write(content)
+
+        context = BuildContext(self.content_dir, self.template_path)
+        jobs = _discover_pages(context, self.content_dir, self.output_dir)
+
+        blog_template = os.path.join(blog_dir, "template.html")
+        expected = [
+            ("about.md", "about.html", self.template_path),
+            ("blog/2024/new.md", "blog/2024/new.html", blog_template),
+            ("blog/post.md", "blog/post.html", blog_template),
+            ("test.md", "test.html", self.template_path),
+            ("zebra.md", "zebra.html", self.template_path),
+        ]
+        self.assertEqual(
+            [
+                (
+                    os.path.relpath(job.source_path, self.content_dir),
+                    os.path.relpath(job.output_path, self.output_dir),
+                    job.template_path,
+                )
+                for job in jobs
+            ],
+            expected,
+        )
+        for job in jobs:
+            self.assertIsInstance(job, PageJob)
+            stat = os.stat(job.source_path)
+            self.assertEqual((job.mtime_ns, job.size),
+                             (stat.st_mtime_ns, stat.st_size))
+
+
+class TestBuildContext(TempDirTestCase):
+    """
+    This class test BuildContext
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.template_path = os.path.join(self.test_dir, "template.html")
+        with open(self.template_path, "w", encoding="UTF-8") as f:
+            f.write('<a href="/">{{ Title }}</a>')
+        self.context = BuildContext(
+            self.test_dir, self.template_path, "/site/")
+
+    def test_load_template_cached(self):
+        """
+        Check against a template compiled once and reused
+        """
+        template = self.context.load_template(self.template_path)
+        self.assertIs(self.context.load_template(self.template_path), template)
+        self.assertEqual(
+            template.render({"Title": "T"}), '<a href="/site/">T</a>')
+
+    def test_load_missing_template(self):
+        """
+        Check against a template that does not exist
+        """
+        missing = os.path.join(self.test_dir, "missing.html")
+        self.assertIsNone(self.context.load_template(missing))
+
+    def test_template_path_for(self):
+        """
+        Check against the resolution of section templates
+        """
+        section_dir = os.path.join(self.test_dir, "blog")
+        nested_dir = os.path.join(section_dir, "2024")
+        os.makedirs(nested_dir)
+        with open(
+            os.path.join(section_dir, "template.html"), "w", encoding="UTF-8"
+        ) as f:
+            f.write("{{ Content }}")
+        self.context.add_section_template(section_dir)
+
+        section_template = os.path.join(section_dir, "template.html")
+        self.assertEqual(
+            self.context.template_path_for(self.test_dir), self.template_path)
+        self.assertEqual(
+            self.context.template_path_for(section_dir), section_template)
+        self.assertEqual(
+            self.context.template_path_for(nested_dir), section_template)
+
+
+class TestIncrementalGeneration(TempDirTestCase):
+    """
+    This class test generate_pages_recursive() with a build manifest
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.content_dir = os.path.join(self.test_dir, "content")
+        os.makedirs(self.content_dir)
+        _write(os.path.join(self.content_dir, "a.md"), "# Page A\n\nA")
+        _write(os.path.join(self.content_dir, "b.md"), "# Page B\n\nB")
+
+        self.template_path = os.path.join(self.test_dir, "template.html")
+        _write(self.template_path, "<h1>{{ Title }}</h1>{{ Content }}")
+
+        self.output_dir = os.path.join(self.test_dir, "public")
+        self.manifest_path = os.path.join(self.test_dir, "manifest.json")
+
+    def _build(self, basepath="/", changes=None):
+        generate_pages_recursive(
+            self.content_dir,
+            self.template_path,
+            self.output_dir,
+            basepath,
+            BuildOptions(manifest_path=self.manifest_path, changes=changes),
+        )
+
+    def _mark_outputs(self):
+        """
+        Overwrite every output so rewritten pages can be detected
+        """
+        for name in ("a.html", "b.html"):
+            _write(os.path.join(self.output_dir, name), "stale")
+
+    def _read_output(self, name):
+        with open(
+            os.path.join(self.output_dir, name), "r", encoding="UTF-8"
+        ) as f:
+            return f.read()
+
+    def test_manifest_written(self):
+        """
+        Check against the manifest being created by a build
+        """
+        self._build()
+        self.assertTrue(os.path.exists(self.manifest_path))
+
+    def test_unchanged_pages_skipped(self):
+        """
+        Check against a rebuild with no change
+        """
+        self._build()
+        self._mark_outputs()
+        self._build()
+        self.assertEqual(self._read_output("a.html"), "stale")
+        self.assertEqual(self._read_output("b.html"), "stale")
+
+    def test_only_dirty_page_rebuilt(self):
+        """
+        Check against a rebuild after a single page changed
+        """
+        self._build()
+        self._mark_outputs()
+        _write(os.path.join(self.content_dir, "a.md"), "# Page A2\n\nA")
+        self._build()
+        self.assertIn("Page A2", self._read_output("a.html"))
+        self.assertEqual(self._read_output("b.html"), "stale")
+
+    def test_template_change_rebuilds_all(self):
+        """
+        Check against a rebuild after the template changed
+        """
+        self._build()
+        self._mark_outputs()
+        _write(self.template_path, "<h2>{{ Title }}</h2>{{ Content }}")
+        self._build()
+        self.assertIn("<h2>Page A</h2>", self._read_output("a.html"))
+        self.assertIn("<h2>Page B</h2>", self._read_output("b.html"))
+
+    def test_basepath_change_rebuilds_all(self):
+        """
+        Check against a rebuild with another basepath
+        """
+        self._build()
+        self._mark_outputs()
+        self._build("/site/")
+        self.assertNotEqual(self._read_output("a.html"), "stale")
+        self.assertNotEqual(self._read_output("b.html"), "stale")
+
+    def test_section_template_change(self):
+        """
+        Check against a rebuild after a section template changed
+        """
+        blog_dir = os.path.join(self.content_dir, "blog")
+        os.makedirs(blog_dir)
+        _write(os.path.join(blog_dir, "post.md"), "# Post")
+        section_template = os.path.join(blog_dir, "template.html")
+        _write(section_template, "<blog>{{ Title }}</blog>")
+        self._build()
+        self._mark_outputs()
+
+        _write(section_template, "<post>{{ Title }}</post>")
+        self._build()
+        self.assertEqual(
+            self._read_output("blog/post.html"), "<post>Post</post>")
+        self.assertEqual(self._read_output("a.html"), "stale")
+
+    def test_default_template_change_keeps_section_pages(self):
+        """
+        Check against a default template change not rebuilding the pages
+        rendered with a section template
+        """
+        blog_dir = os.path.join(self.content_dir, "blog")
+        os.makedirs(blog_dir)
+        _write(os.path.join(blog_dir, "post.md"), "# Post")
+        _write(os.path.join(blog_dir, "template.html"),
+               "<blog>{{ Title }}</blog>")
+        self._build()
+        _write(os.path.join(self.output_dir, "blog", "post.html"), "stale")
+
+        _write(self.template_path, "<h2>{{ Title }}</h2>{{ Content }}")
+        self._build()
+        self.assertEqual(self._read_output("blog/post.html"), "stale")
+        self.assertIn("<h2>Page A</h2>", self._read_output("a.html"))
+
+    def test_new_section_template_rebuilds_section(self):
+        """
+        Check against a section template added after a build
+        """
+        blog_dir = os.path.join(self.content_dir, "blog")
+        os.makedirs(blog_dir)
+        _write(os.path.join(blog_dir, "post.md"), "# Post")
+        self._build()
+        self._mark_outputs()
+
+        _write(os.path.join(blog_dir, "template.html"),
+               "<blog>{{ Title }}</blog>")
+        self._build()
+        self.assertEqual(
+            self._read_output("blog/post.html"), "<blog>Post</blog>")
+        self.assertEqual(self._read_output("a.html"), "stale")
+
+    def test_changes_limit_rebuild(self):
+        """
+        Check against a rebuild given the changed paths, other pages of
+        the manifest are not read and new pages are built
+        """
+        self._build()
+        self._mark_outputs()
+        a_path = os.path.join(self.content_dir, "a.md")
+        _write(a_path, "# Page A2\n\nA")
+        _write(os.path.join(self.content_dir, "b.md"), "# Page B2\n\nB")
+        _write(os.path.join(self.content_dir, "c.md"), "# Page C\n\nC")
+
+        self._build(changes={a_path})
+        self.assertIn("Page A2", self._read_output("a.html"))
+        self.assertEqual(self._read_output("b.html"), "stale")
+        self.assertIn("Page C", self._read_output("c.html"))
+
+        self._build()
+        self.assertIn("Page B2", self._read_output("b.html"))
+
+    def test_changes_template_dependents(self):
+        """
+        Check against a rebuild given changed templates, only the pages
+        depending on them or under a new section template are rebuilt
+        """
+        blog_dir = os.path.join(self.content_dir, "blog")
+        os.makedirs(blog_dir)
+        _write(os.path.join(blog_dir, "post.md"), "# Post")
+        self._build()
+        self._mark_outputs()
+        _write(os.path.join(self.output_dir, "blog", "post.html"), "stale")
+
+        section_template = os.path.join(blog_dir, "template.html")
+        _write(section_template, "<blog>{{ Title }}</blog>")
+        self._build(changes={section_template})
+        self.assertEqual(
+            self._read_output("blog/post.html"), "<blog>Post</blog>")
+        self.assertEqual(self._read_output("a.html"), "stale")
+
+        _write(self.template_path, "<h2>{{ Title }}</h2>{{ Content }}")
+        self._build(changes={self.template_path})
+        self.assertIn("<h2>Page A</h2>", self._read_output("a.html"))
+        self.assertIn("<h2>Page B</h2>", self._read_output("b.html"))
+        self.assertEqual(
+            self._read_output("blog/post.html"), "<blog>Post</blog>")
+
+    def test_changed_sources(self):
+        """
+        Check against changed paths mapped to the pages depending on them
+        """
+        blog_dir = os.path.join(self.content_dir, "blog")
+        os.makedirs(blog_dir)
+        _write(os.path.join(blog_dir, "post.md"), "# Post")
+        self._build()
+        manifest = BuildManifest.load(self.manifest_path)
+        post_key = os.path.join("blog", "post.md")
+
+        def sources(*paths):
+            return changed_sources(manifest, set(paths), self.content_dir)
+
+        page_path = os.path.join(self.content_dir, "a.md")
+        section_template = os.path.join(blog_dir, "template.html")
+        new_path = os.path.join(self.content_dir, "new.md")
+        self.assertEqual(sources(page_path), {"a.md"})
+        self.assertEqual(sources(self.template_path),
+                         {"a.md", "b.md", post_key})
+        self.assertEqual(sources(section_template), {post_key})
+        self.assertEqual(sources(new_path), set())
+        self.assertIsNone(sources(page_path, blog_dir))
+
+    def test_unchanged_source_not_read(self):
+        """
+        Check against sources with the modification time and size recorded
+        by the previous build, which are not read again
+        """
+        for name in ("a.md", "b.md"):
+            os.utime(os.path.join(self.content_dir, name),
+                     (1000000000, 1000000000))
+        self._build()
+        _write(os.path.join(self.content_dir, "a.md"), "# Page A2\n\nA")
+
+        with mock.patch.object(
+            generator, "_read_file_safely", wraps=_read_file_safely
+        ) as read_file:
+            self._build()
+        read_paths = [call.args[0] for call in read_file.call_args_list]
+        self.assertIn(os.path.join(self.content_dir, "a.md"), read_paths)
+        self.assertNotIn(os.path.join(self.content_dir, "b.md"), read_paths)
+        self.assertIn("Page A2", self._read_output("a.html"))
+
+    def test_recent_source_read(self):
+        """
+        Check against a source modified just before the build, whose hash
+        is not recorded by stat as it may change within the same mtime
+        """
+        self._build()
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertEqual(manifest.sources, {})
+
+    def test_identical_output_not_rewritten(self):
+        """
+        Check against a full rebuild producing the same HTML
+        """
+        self._build()
+        output_path = os.path.join(self.output_dir, "a.html")
+        os.utime(output_path, (1000000000, 1000000000))
+        os.remove(self.manifest_path)
+        self._build()
+        self.assertEqual(os.path.getmtime(output_path), 1000000000)
+        self.assertIn("Page A", self._read_output("a.html"))
+
+    def test_identical_output_compared_with_manifest(self):
+        """
+        Check against a rebuild producing the same HTML, compared with the
+        hash recorded in the manifest without writing or reading the output
+        """
+        self._build()
+        output_path = os.path.join(self.output_dir, "a.html")
+        os.utime(output_path, (1000000000, 1000000000))
+        _write(os.path.join(self.content_dir, "a.md"), "# Page A\n\n\nA")
+        with mock.patch.object(
+            generator, "_write_file_safely"
+        ) as write_file, mock.patch.object(
+            generator, "_file_digest"
+        ) as file_digest:
+            self._build()
+        write_file.assert_not_called()
+        file_digest.assert_not_called()
+        self.assertEqual(os.path.getmtime(output_path), 1000000000)
+
+    def test_changed_output_rewritten(self):
+        """
+        Check against an output file changed since the previous build
+        """
+        self._build()
+        _write(
+            os.path.join(self.output_dir, "a.html"), "<h1>Page A</h1>edited")
+        os.remove(self.manifest_path)
+        self._build()
+        self.assertNotIn("edited", self._read_output("a.html"))
+
+    def test_deleted_output_rebuilt(self):
+        """
+        Check against a rebuild after an output file was removed
+        """
+        self._build()
+        os.remove(os.path.join(self.output_dir, "a.html"))
+        self._build()
+        self.assertIn("Page A", self._read_output("a.html"))
+
+
+class TestWriteFileSafely(TempDirTestCase):
+    """
+    This class test the atomic _write_file_safely()
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.file_path = os.path.join(self.test_dir, "page.html")
+        with open(self.file_path, "w", encoding="UTF-8") as f:
+            f.write("old")
+
+    def test_chunks_written(self):
+        """
+        Check against content given as chunks
+        """
+        self.assertTrue(_write_file_safely(self.file_path, ["<p>", "new</p>"]))
+        with open(self.file_path, "r", encoding="UTF-8") as f:
+            self.assertEqual(f.read(), "<p>new</p>")
+        self.assertEqual(os.listdir(self.test_dir), ["page.html"])
+
+    def test_interrupted_write_keeps_file(self):
+        """
+        Check against content failing while being written
+        """
+
+        def chunks():
+            yield "<p>half"
+            raise OSError("disk full")
+
+        self.assertIsNone(_write_file_safely(self.file_path, chunks()))
+        with open(self.file_path, "r", encoding="UTF-8") as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.test_dir), ["page.html"])
+
+    def test_same_content_kept(self):
+        """
+        Check against streamed chunks holding the bytes already written,
+        CRLF line endings included
+        """
+        html = ["<p>line\r\n", "next</p>\r\n"]
+        self.assertTrue(
+            _write_file_safely(self.file_path, html, keep_same=True))
+        os.utime(self.file_path, (1000000000, 1000000000))
+        self.assertFalse(
+            _write_file_safely(self.file_path, iter(html), keep_same=True))
+        self.assertEqual(os.path.getmtime(self.file_path), 1000000000)
+        self.assertEqual(os.listdir(self.test_dir), ["page.html"])
+
+        self.assertTrue(
+            _write_file_safely(self.file_path, "<p>line\n", keep_same=True))
+        with open(self.file_path, "rb") as f:
+            self.assertEqual(f.read(), b"<p>line\n")
+
+
+class TestSyncStatic(TempDirTestCase):
+    """
+    This class test sync_static()
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.static_dir = os.path.join(self.test_dir, "static")
+        self.dest_dir = os.path.join(self.test_dir, "docs")
+        os.makedirs(os.path.join(self.static_dir, "images"))
+        _write(os.path.join(self.static_dir, "index.css"), "body {}")
+        _write(os.path.join(self.static_dir, "images", "logo.png"), "png")
+        self.manifest = BuildManifest(
+            os.path.join(self.test_dir, "manifest.json"))
+
+    def _read(self, name):
+        with open(
+            os.path.join(self.dest_dir, name), "r", encoding="UTF-8"
+        ) as f:
+            return f.read()
+
+    def test_first_sync_copies_all(self):
+        """
+        Check against a sync to an empty directory
+        """
+        self.assertEqual(
+            sync_static(self.static_dir, self.dest_dir, self.manifest),
+            (2, 0, 0))
+        self.assertEqual(self._read("images/logo.png"), "png")
+        self.assertEqual(
+            self.manifest.assets,
+            [os.path.join("images", "logo.png"), "index.css"],
+        )
+
+    def test_unchanged_files_skipped(self):
+        """
+        Check against a second sync with no change
+        """
+        sync_static(self.static_dir, self.dest_dir, self.manifest)
+        self.assertEqual(
+            sync_static(self.static_dir, self.dest_dir, self.manifest),
+            (0, 2, 0))
+
+    def test_changed_file_copied(self):
+        """
+        Check against a sync after a static file changed
+        """
+        sync_static(self.static_dir, self.dest_dir, self.manifest)
+        css_path = os.path.join(self.static_dir, "index.css")
+        _write(css_path, "body { color: red; }")
+        os.utime(css_path, (2000000000, 2000000000))
+        self.assertEqual(
+            sync_static(self.static_dir, self.dest_dir, self.manifest),
+            (1, 1, 0))
+        self.assertEqual(self._read("index.css"), "body { color: red; }")
+
+    def test_orphans_removed_pages_kept(self):
+        """
+        Check against a sync after a static file was deleted
+        """
+        sync_static(self.static_dir, self.dest_dir, self.manifest)
+        _write(os.path.join(self.dest_dir, "index.html"), "<p>page</p>")
+        shutil.rmtree(os.path.join(self.static_dir, "images"))
+        self.assertEqual(
+            sync_static(self.static_dir, self.dest_dir, self.manifest),
+            (0, 1, 1))
+        self.assertEqual(sorted(os.listdir(self.dest_dir)),
+                         ["index.css", "index.html"])
+
+    def test_no_removal_without_manifest(self):
+        """
+        Check against a sync without manifest
+        """
+        os.makedirs(self.dest_dir)
+        _write(os.path.join(self.dest_dir, "old.css"), "old")
+        sync_static(self.static_dir, self.dest_dir)
+        self.assertEqual(self._read("old.css"), "old")
+
+    def test_changed_assets(self):
+        """
+        Check against a sync limited to changed, new and removed files
+        """
+        sync_static(self.static_dir, self.dest_dir, self.manifest)
+        _write(os.path.join(self.static_dir, "index.css"),
+               "body { margin: 0 }")
+        os.makedirs(os.path.join(self.static_dir, "fonts"))
+        _write(os.path.join(self.static_dir, "fonts", "main.woff"), "woff")
+        shutil.rmtree(os.path.join(self.static_dir, "images"))
+
+        self.assertEqual(
+            sync_static(
+                self.static_dir,
+                self.dest_dir,
+                self.manifest,
+                assets={"index.css", "fonts", "images"},
+            ),
+            (2, 0, 1),
+        )
+        self.assertEqual(self._read("index.css"), "body { margin: 0 }")
+        self.assertEqual(self._read("fonts/main.woff"), "woff")
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, "images")))
+        self.assertEqual(
+            self.manifest.assets,
+            [os.path.join("fonts", "main.woff"), "index.css"],
+        )
+
+    def test_hardlink(self):
+        """
+        Check against a sync linking files instead of copying them
+        """
+        copier = StaticCopier(hardlink=True)
+        sync_static(self.static_dir, self.dest_dir, copier=copier)
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.static_dir, "index.css"),
+                os.path.join(self.dest_dir, "index.css"),
+            )
+        )
+        self.assertEqual(
+            sync_static(self.static_dir, self.dest_dir, copier=copier),
+            (0, 2, 0))
+
+    def test_reflink_unsupported(self):
+        """
+        Check against a filesystem that cannot clone files
+        """
+        copier = StaticCopier(threads=1)
+        copier.reflink = True
+        error = OSError(errno.EOPNOTSUPP, "Operation not supported")
+        with mock.patch.object(
+            generator.fcntl, "ioctl", side_effect=error
+        ) as ioctl:
+            self.assertEqual(
+                sync_static(self.static_dir, self.dest_dir, copier=copier),
+                (2, 0, 0))
+            self.assertEqual(ioctl.call_count, 1)
+        self.assertFalse(copier.reflink)
+        self.assertEqual(self._read("images/logo.png"), "png")
+        self.assertEqual(self._read("index.css"), "body {}")
+
+    def test_reflink_cross_device(self):
+        """
+        Check against a file pair on two filesystems, which does not stop
+        the cloning of the next files
+        """
+        copier = StaticCopier(threads=1)
+        copier.reflink = True
+        error = OSError(errno.EXDEV, "Invalid cross-device link")
+        with mock.patch.object(
+            generator.fcntl, "ioctl", side_effect=error
+        ) as ioctl:
+            self.assertEqual(
+                sync_static(self.static_dir, self.dest_dir, copier=copier),
+                (2, 0, 0))
+            self.assertEqual(ioctl.call_count, 2)
+        self.assertTrue(copier.reflink)
+        self.assertEqual(self._read("index.css"), "body {}")
+
+
+class TestCachedGeneration(TempDirTestCase):
+    """
+    This class test generate_pages_recursive() with a page cache
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.content_dir = os.path.join(self.test_dir, "content")
+        os.makedirs(self.content_dir)
+        for name in ("a", "b", "c"):
+            _write(
+                os.path.join(self.content_dir, f"{name}.md"),
+                f"---\nAuthor: {name}\n---\n# Page\n\nSee [home](/index.html)",
+            )
+
+        self.template_path = os.path.join(self.test_dir, "template.html")
+        _write(
+            self.template_path,
+            "<h1>{{ Title }}</h1><i>{{ Author }}</i>{{ Content }}",
+        )
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+
+    def _build(self, output_name, basepath="/", jobs=1, cache_dir=None):
+        output_dir = os.path.join(self.test_dir, output_name)
+        generate_pages_recursive(
+            self.content_dir,
+            self.template_path,
+            output_dir,
+            basepath,
+            BuildOptions(jobs=jobs, cache_dir=cache_dir),
+        )
+        outputs = {}
+        for name in ("a.html", "b.html", "c.html"):
+            with open(
+                os.path.join(output_dir, name), "r", encoding="UTF-8"
+            ) as f:
+                outputs[name] = f.read()
+        return outputs
+
+    def test_same_output_as_without_cache(self):
+        """
+        Check against builds with an empty then a filled cache
+        """
+        expected = self._build("plain", "/site/")
+        self.assertEqual(
+            self._build("first", "/site/", cache_dir=self.cache_dir),
+            expected)
+        self.assertEqual(
+            self._build("second", "/site/", cache_dir=self.cache_dir),
+            expected)
+        self.assertIn("<i>b</i>", expected["b.html"])
+        self.assertIn('href="/site/index.html"', expected["b.html"])
+
+    def test_parallel_with_cache(self):
+        """
+        Check against a parallel build with a page cache
+        """
+        expected = self._build("plain")
+        self.assertEqual(
+            self._build("parallel", jobs=2, cache_dir=self.cache_dir),
+            expected)
+
+    def test_cached_body_reused(self):
+        """
+        Check against a body read from the cache instead of converted
+        """
+        self._build("first", cache_dir=self.cache_dir)
+        cache = PageCache.open(self.cache_dir, 1000)
+        body = "# Page\n\nSee [home](/index.html)"
+        self.assertIsNotNone(cache.get(cache.key(body)))
+        cache.put(cache.key(body), "<p>cached</p>", "Cached")
+        cache.close()
+
+        outputs = self._build("second", cache_dir=self.cache_dir)
+        self.assertEqual(outputs["a.html"],
+                         "<h1>Cached</h1><i>a</i><p>cached</p>")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,8 @@ Test case class for HTMLNode class
 import unittest
 
 from src.htmlnode import HTMLNode
+from src.leafnode import LeafNode
+from src.parentnode import ParentNode
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -49,6 +51,65 @@ class TestHTMLNode(unittest.TestCase):
         list_node.children, list
     )  # The children should be a list of HTMLNodes
 
+    def test_no_instance_dict(self):
+        """
+        Test that HTMLNode and its subclasses use slots
+        """
+        for node in (
+            HTMLNode("p", "text"),
+            LeafNode("b", "bold"),
+            ParentNode("div", [LeafNode(None, "text")]),
+        ):
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_attributes(self):
+        """
+        Test that attributes can still be read and set
+        """
+        node = HTMLNode("p", "text", None, {"class": "intro"})
+        node.tag = "span"
+        node.value = "other"
+        self.assertEqual(node.tag, "span")
+        self.assertEqual(node.value, "other")
+        self.assertEqual(node.children, [])
+        self.assertEqual(node.props, {"class": "intro"})
+
+    def test_invalid_children(self):
+        """
+        Test that children must be HTMLNode
+        """
+        with self.assertRaises(ValueError):
+            HTMLNode("div", None, ["not a node"])
+
+    def test_props_setter_resets_attributes(self):
+        """
+        Test that setting props renders the new attributes
+        """
+        node = LeafNode("a", "link", {"href": "/a"})
+        self.assertEqual(node.to_html(), '<a href="/a">link</a>')
+        node.props = {"href": "/b"}
+        self.assertEqual(node.to_html(), '<a href="/b">link</a>')
+        node.props = None
+        self.assertEqual(node.to_html(), "<a>link</a>")
+
+    def test_shared_attributes(self):
+        """
+        Test that equal props share the same attribute string
+        """
+        node1 = LeafNode("a", "one", {"href": "/index.html", "class": "nav"})
+        node2 = LeafNode("a", "two", {"href": "/index.html", "class": "nav"})
+        self.assertIs(node1.props_to_html(), node2.props_to_html())
+
+    def test_attributes_not_shared_across_types(self):
+        """
+        Test that equal values of different types keep their own attributes
+        """
+        self.assertEqual(
+            HTMLNode("td", props={"span": 1}).props_to_html(), ' span="1"')
+        self.assertEqual(
+            HTMLNode("td", props={"span": True}).props_to_html(),
+            ' span="True"')
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,140 @@
+"""
+This module hold test cases for the InlineScanner class,
+checked against the MarkdownNodes pipeline
+"""
+
+import random
+import unittest
+
+from src.inlinescanner import InlineScanner
+from src.markdownnode import MarkdownNodes
+from src.textnode import TextNode, TextType
+
+# Inputs of the text_to_textnodes tests of test_markdownnodes.py
+PIPELINE_INPUTS = [
+    "This is plain text.",
+    "This is **bold** text.",
+    "Text with *italic* style.",
+    "Mix of **bold** and *italic* styles.",
+    "Here is a [link](https://example.com) with *italics*, "
+    "**bold**, and ![an image](https://image.com).",
+    "This is ***both bold and italic*** text",
+    "***bold and italic*** something *italic* something ** bold** something",
+    "This is *italic with **bold** inside* text",
+    "This is **bold with *italic* inside** text",
+    "**bold _italic_ bold**",
+    "_italic **bold `code` bold** italic_",
+    "Some `code with **not bold** inside` here",
+    "__bold__ and _italic_ and `code` and ***both***",
+    "**bold** followed by **rebold** and then *italic*.",
+    "**only bolded text**",
+    "![img](/a.png)![img2](/b.png) [link](/c) [[no]](link)",
+]
+
+
+class TestInlineScanner(unittest.TestCase):
+    """
+    Test class for InlineScanner.text_to_textnodes
+    """
+
+    def test_same_as_pipeline(self):
+        """
+        Check against the MarkdownNodes pipeline on known inputs
+        """
+        for text in PIPELINE_INPUTS:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    InlineScanner.text_to_textnodes(text),
+                    MarkdownNodes.text_to_textnodes(text),
+                )
+
+    def test_same_as_pipeline_random(self):
+        """
+        Check against the MarkdownNodes pipeline on random inputs,
+        including the ones raising an error
+        """
+        pieces = ["a", " ", "*", "**", "***", "_", "__", "`", "!", "[", "]",
+                  "(", ")", "[x](/u)", "![i](/p)", "[y]()"]
+        rnd = random.Random(42)
+
+        def run(parser, text):
+            try:
+                return parser.text_to_textnodes(text)
+            except ValueError:
+                return ValueError
+
+        for _ in range(3000):
+            text = "".join(rnd.choice(pieces)
+                           for _ in range(rnd.randint(0, 12)))
+            with self.subTest(text=text):
+                self.assertEqual(
+                    run(InlineScanner, text), run(MarkdownNodes, text))
+
+    def test_without_validation_random(self):
+        """
+        Check against the validated pipeline on random inputs,
+        with the validation of both parsers skipped
+        """
+        pieces = ["a", " ", "*", "**", "_", "`", "[x](/u)", "![i](/p)",
+                  "[y]()", "![j]()"]
+        rnd = random.Random(13)
+
+        def run(parser, text, validate):
+            try:
+                return parser.text_to_textnodes(text, validate)
+            except ValueError:
+                return ValueError
+
+        for _ in range(3000):
+            text = "".join(rnd.choice(pieces)
+                           for _ in range(rnd.randint(0, 12)))
+            expected = run(MarkdownNodes, text, True)
+            with self.subTest(text=text):
+                self.assertEqual(run(MarkdownNodes, text, False), expected)
+                self.assertEqual(run(InlineScanner, text, False), expected)
+
+    def test_nested_styles(self):
+        """
+        Check against nested bold and italic
+        """
+        self.assertEqual(
+            InlineScanner.text_to_textnodes("**bold _both_**"),
+            [
+                TextNode("bold ", {TextType.BOLD}),
+                TextNode("both", {TextType.BOLD, TextType.ITALIC}),
+            ],
+        )
+
+    def test_missing_delimiter_raises_error(self):
+        """
+        Check against an unclosed delimiter
+        """
+        with self.assertRaises(ValueError):
+            InlineScanner.text_to_textnodes("This is `not closed")
+
+    def test_empty_url_raises_error(self):
+        """
+        Check against a link without url
+        """
+        with self.assertRaises(ValueError):
+            InlineScanner.text_to_textnodes("A [link]() here")
+
+    def test_empty_text_raises_error(self):
+        """
+        Check against an empty text
+        """
+        with self.assertRaises(ValueError):
+            InlineScanner.text_to_textnodes("")
+
+    def test_many_delimiters(self):
+        """
+        Check against a text with more emphasis than the recursion limit
+        """
+        text = " ".join("**bold** *it*" for _ in range(3000))
+        nodes = InlineScanner.text_to_textnodes(text)
+        self.assertEqual(len(nodes), 3000 * 4 - 1)
+        self.assertEqual(nodes[-1], TextNode("it", {TextType.ITALIC}))
+
+
+if __name__ == "__main__":
+    unittest.main()
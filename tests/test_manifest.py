@@ -0,0 +1,169 @@
+"""
+Test module for manifest.py
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.manifest import BuildManifest, hash_content
+
+
+class TestBuildManifest(unittest.TestCase):
+    """
+    This class test BuildManifest
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.test_dir, "manifest.json")
+        self.output_path = os.path.join(self.test_dir, "index.html")
+        with open(self.output_path, "w", encoding="UTF-8") as f:
+            f.write("<p>page</p>")
+
+    def tearDown(self):
+        """
+        Clean up temporary directory
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_missing_file_gives_empty_manifest(self):
+        """
+        Check against loading a manifest that does not exist
+        """
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertEqual(manifest.pages, {})
+        self.assertEqual(manifest.assets, [])
+
+    def test_corrupt_file_gives_empty_manifest(self):
+        """
+        Check against loading a manifest that is not valid JSON
+        """
+        with open(self.manifest_path, "w", encoding="UTF-8") as f:
+            f.write("{not json")
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertEqual(manifest.pages, {})
+
+    def _inputs(self, source="# Hi", template="template", basepath="/"):
+        return {
+            "source:index.md": hash_content(source),
+            "template:template.html": hash_content(template),
+            "basepath": basepath,
+        }
+
+    def test_round_trip(self):
+        """
+        Check against saving then loading a manifest
+        """
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("index.md", self.output_path,
+                        self._inputs(), ["abc", 3])
+        manifest.assets = ["index.css"]
+        self.assertTrue(manifest.save())
+
+        loaded = BuildManifest.load(self.manifest_path)
+        self.assertEqual(loaded.assets, ["index.css"])
+        self.assertTrue(
+            loaded.is_fresh("index.md", self._inputs(), self.output_path))
+        self.assertEqual(loaded.output_digest("index.md"), ["abc", 3])
+        self.assertIsNone(loaded.output_digest("missing.md"))
+
+    def test_old_version_ignored(self):
+        """
+        Check against loading a manifest written by another version
+        """
+        with open(self.manifest_path, "w", encoding="UTF-8") as f:
+            f.write('{"version": 1, "pages": {"index.md": {"hash": "1"}}}')
+        self.assertEqual(BuildManifest.load(self.manifest_path).pages, {})
+
+    def test_changed_input_is_dirty(self):
+        """
+        Check against a page whose source, template or basepath changed
+        """
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("index.md", self.output_path, self._inputs())
+        self.assertTrue(
+            manifest.is_fresh("index.md", self._inputs(), self.output_path))
+        for inputs in (
+            self._inputs(source="# Hello"),
+            self._inputs(template="other"),
+            self._inputs(basepath="/site/"),
+        ):
+            self.assertFalse(manifest.is_fresh(
+                "index.md", inputs, self.output_path))
+
+    def test_changed_template_path_is_dirty(self):
+        """
+        Check against a page now rendered with another template
+        """
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("index.md", self.output_path, self._inputs())
+        inputs = self._inputs()
+        inputs["template:blog/template.html"] = inputs.pop(
+            "template:template.html")
+        self.assertFalse(
+            manifest.is_fresh("index.md", inputs, self.output_path))
+
+    def test_missing_output_is_dirty(self):
+        """
+        Check against a page whose output file was removed
+        """
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("index.md", self.output_path, self._inputs())
+        os.remove(self.output_path)
+        self.assertFalse(
+            manifest.is_fresh("index.md", self._inputs(), self.output_path))
+
+    def test_source_hash(self):
+        """
+        Check against a source hash recorded with the modification time
+        and size of the file, and forgotten with its page
+        """
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record_source("a.md", 1000, 12, "hash")
+        manifest.record_source("b.md", 1000, 12, "other")
+        self.assertEqual(manifest.source_hash("a.md", 1000, 12), "hash")
+        self.assertIsNone(manifest.source_hash("a.md", 2000, 12))
+        self.assertIsNone(manifest.source_hash("a.md", 1000, 13))
+        self.assertIsNone(manifest.source_hash("c.md", 1000, 12))
+
+        manifest.prune({"a.md"})
+        self.assertEqual(list(manifest.sources), ["a.md"])
+
+    def test_dependents(self):
+        """
+        Check against the pages depending on changed inputs
+        """
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record(
+            "a.md", "a.html",
+            {"source:a.md": "1", "template:t.html": "2"})
+        manifest.record(
+            "b.md", "b.html",
+            {"source:b.md": "1", "template:t.html": "2"})
+        manifest.record(
+            "c.md", "c.html",
+            {"source:c.md": "1", "template:s.html": "3"})
+        self.assertEqual(manifest.dependents({"source:a.md"}), {"a.md"})
+        self.assertEqual(
+            manifest.dependents({"template:t.html"}), {"a.md", "b.md"})
+        self.assertEqual(
+            manifest.dependents({"source:c.md", "template:t.html"}),
+            {"a.md", "b.md", "c.md"},
+        )
+        self.assertEqual(manifest.dependents({"static:index.css"}), set())
+
+    def test_prune(self):
+        """
+        Check against forgetting pages that were not seen
+        """
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", self.output_path, {"source:a.md": "1"})
+        manifest.record("b.md", self.output_path, {"source:b.md": "2"})
+        manifest.prune({"a.md"})
+        self.assertEqual(list(manifest.pages), ["a.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -262,6 +262,24 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(expected, MarkdownNodes.text_to_textnodes(input_text))
 
+    def test_without_validation(self):
+        """
+        Check against the same text with the validation skipped
+        """
+        input_text = "A [link](https://example.com) and **bold _both_**"
+        self.assertEqual(
+            MarkdownNodes.text_to_textnodes(input_text, validate=False),
+            MarkdownNodes.text_to_textnodes(input_text),
+        )
+
+    def test_without_validation_empty_url(self):
+        """
+        Check against an image without url with the validation skipped
+        """
+        with self.assertRaises(ValueError):
+            MarkdownNodes.text_to_textnodes(
+                "An ![image]() here", validate=False)
+
 
 class TestSplitNodesDelimiter(unittest.TestCase):
     """
@@ -680,6 +698,25 @@ class TestSplitNodesLink(unittest.TestCase):
         self.assertEqual(result[2].content, "link2", {TextType.NORMAL})
         self.assertEqual(result[2].url, "url2", {TextType.NORMAL})
 
+    def test_split_nodes_link_repeated_links(self):
+        """
+        Check against the same link repeated many times
+        """
+        node = TextNode(" | ".join(["[home](/)"] * 3000), {TextType.NORMAL})
+        nodes = MarkdownNodes.split_nodes_link([node])
+        self.assertEqual(len(nodes), 3000 * 2 - 1)
+        self.assertEqual(nodes[0], TextNode("home", {TextType.LINK}, "/"))
+        self.assertEqual(nodes[1], TextNode(" | ", {TextType.NORMAL}))
+        self.assertEqual(nodes[-1], TextNode("home", {TextType.LINK}, "/"))
+
+    def test_split_nodes_link_after_image_text(self):
+        """
+        Check against a link right after a text ending with "!"
+        """
+        node = TextNode("Wow![a](b)", {TextType.NORMAL})
+        nodes = MarkdownNodes.split_nodes_link([node])
+        self.assertEqual(nodes, [TextNode("Wow![a](b)", {TextType.NORMAL})])
+
 
 class TestValidateTextnodes(unittest.TestCase):
     """
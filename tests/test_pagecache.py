@@ -0,0 +1,113 @@
+"""
+Test module for pagecache.py
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.pagecache import PageCache, converter_fingerprint
+
+
+class TestPageCache(unittest.TestCase):
+    """
+    This class test PageCache
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+
+    def tearDown(self):
+        """
+        Clean up temporary directory
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_missing_entry(self):
+        """
+        Check against reading a body that was never stored
+        """
+        cache = PageCache.open(self.cache_dir, 1000)
+        self.assertIsNone(cache.get(cache.key("# Title")))
+        self.assertEqual(cache.misses, 1)
+        cache.close()
+
+    def test_round_trip(self):
+        """
+        Check against reading an entry stored by a previous build
+        """
+        cache = PageCache.open(self.cache_dir, 1000)
+        cache.put(cache.key("# Title"), "<h1>Title</h1>", "Title")
+        cache.close()
+
+        cache = PageCache.open(self.cache_dir, 1000)
+        self.assertEqual(cache.get(cache.key("# Title")),
+                         ("<h1>Title</h1>", "Title"))
+        self.assertEqual(cache.hits, 1)
+        cache.close()
+
+    def test_missing_keys(self):
+        """
+        Check against the keys missing from the cache, each counted once
+        """
+        cache = PageCache.open(self.cache_dir, 1000)
+        cached, missing = cache.key("# Cached"), cache.key("# Missing")
+        cache.put(cached, "<h1>Cached</h1>", "Cached")
+        self.assertEqual(cache.missing([cached, missing, missing]), {missing})
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        cache.close()
+
+    def test_key_depends_on_body(self):
+        """
+        Check against keys of different bodies
+        """
+        cache = PageCache.open(self.cache_dir, 1000)
+        self.assertEqual(cache.key("# A"), cache.key("# A"))
+        self.assertNotEqual(cache.key("# A"), cache.key("# B"))
+        cache.close()
+
+    def test_key_depends_on_converter(self):
+        """
+        Check against keys of the same body with another converter code
+        """
+        cache = PageCache.open(self.cache_dir, 1000)
+        self.assertEqual(cache.fingerprint, converter_fingerprint())
+        key = cache.key("# A")
+        cache.fingerprint = "other converter"
+        self.assertNotEqual(cache.key("# A"), key)
+        cache.close()
+
+    def test_least_recently_used_evicted(self):
+        """
+        Check against a cache larger than its maximum size
+        """
+        cache = PageCache.open(self.cache_dir, 10)
+        cache.put("old", "12345", "Old")
+        cache.put("used", "12345", "Used")
+        cache.put("new", "12345", "New")
+        cache.get("used")
+        cache.close()
+
+        cache = PageCache.open(self.cache_dir, 10)
+        self.assertIsNone(cache.get("old"))
+        self.assertIsNotNone(cache.get("used"))
+        self.assertIsNotNone(cache.get("new"))
+        cache.close()
+
+    def test_corrupt_file_ignored(self):
+        """
+        Check against a cache file that is not a database
+        """
+        os.makedirs(self.cache_dir)
+        with open(
+            os.path.join(self.cache_dir, PageCache.FILE_NAME), "w",
+            encoding="UTF-8",
+        ) as f:
+            f.write("not a database" * 100)
+        self.assertIsNone(PageCache.open(self.cache_dir, 1000))
+
+
+if __name__ == "__main__":
+    unittest.main()
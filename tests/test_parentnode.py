@@ -2,6 +2,7 @@
 Test class for ParentNode class
 """
 
+import io
 import unittest
 
 from src.leafnode import LeafNode
@@ -132,6 +133,54 @@ class TestParentNode(unittest.TestCase):
 
         self.assertEqual(node.to_html(), expected)
 
+    def test_iter_html_chunks(self):
+        """
+        Test that iter_html yields tags and leaves as separate chunks
+        """
+        node = ParentNode(
+            "div",
+            [ParentNode(
+                "p", [LeafNode("b", "bold"), LeafNode(None, " text")])],
+            {"class": "post"},
+        )
+        self.assertEqual(
+            list(node.iter_html()),
+            [
+                '<div class="post">', "<p>", "<b>bold</b>", " text", "</p>",
+                "</div>",
+            ],
+        )
+
+    def test_render_to_stream(self):
+        """
+        Test that render_to writes the same HTML as to_html
+        """
+        node = ParentNode(
+            "ul", [ParentNode("li", [LeafNode("a", "x", {"href": "/x"})])])
+        stream = io.StringIO()
+        node.render_to(stream)
+        self.assertEqual(stream.getvalue(), node.to_html())
+
+    def test_iter_html_invalid_child(self):
+        """
+        Test that a nested ParentNode without children raise Error
+        """
+        node = ParentNode("div", [ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+            node.to_html()
+
+    def test_deeply_nested_parent_nodes(self):
+        """
+        Test a tree deeper than the recursion limit
+        """
+        node = LeafNode(None, "deep")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span><span>"))
+        self.assertIn("deep", html)
+        self.assertEqual(html.count("</span>"), 5000)
+
 
 if __name__ == "__main__":
     unittest.main()
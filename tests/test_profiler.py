@@ -0,0 +1,91 @@
+"""
+Test module for profiler.py
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.profiler import BuildProfile
+
+
+class TestBuildProfile(unittest.TestCase):
+    """
+    This class test BuildProfile
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.profile = BuildProfile()
+
+    def tearDown(self):
+        """
+        Clean up temporary directory
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_timed(self):
+        """
+        Check against a call returning its result and recording its time
+        """
+        self.assertEqual(self.profile.timed("read", max, 1, 2), 2)
+        self.assertGreater(self.profile.stages["read"], 0)
+        self.assertEqual(self.profile.stages["write"], 0)
+
+    def test_timed_error(self):
+        """
+        Check against a failing call still recording its time
+        """
+        with self.assertRaises(ValueError):
+            self.profile.timed("inline", int, "not a number")
+        self.assertGreater(self.profile.stages["inline"], 0)
+
+    def test_slowest_pages(self):
+        """
+        Check against pages ranked by time
+        """
+        self.profile.add_page("a.md", 0.1, 10)
+        self.profile.add_page("b.md", 0.3, 20)
+        self.profile.add_page("c.md", 0.2, 30)
+        self.assertEqual(
+            self.profile.slowest_pages(2),
+            [("b.md", (0.3, 20)), ("c.md", (0.2, 30))],
+        )
+
+    def test_report(self):
+        """
+        Check against the summary table
+        """
+        self.profile.add("blocks", 0.25)
+        self.profile.add("inline", 0.75)
+        self.profile.add_page("slow.md", 0.5, 1234)
+        report = self.profile.report()
+        self.assertIn("inline        0.7500  75.0%", report)
+        self.assertIn("total         1.0000", report)
+        self.assertTrue(report.endswith("   0.5000     1234  slow.md"))
+
+    def test_save_json(self):
+        """
+        Check against the JSON report
+        """
+        self.profile.add("write", 0.5)
+        self.profile.add_page("a.md", 0.1, 10)
+        path = os.path.join(self.test_dir, "profile.json")
+        self.assertTrue(self.profile.save_json(path))
+        with open(path, "r", encoding="UTF-8") as f:
+            data = json.load(f)
+        self.assertEqual(data["stages"]["write"], 0.5)
+        self.assertEqual(data["pages"], {"a.md": {"seconds": 0.1, "size": 10}})
+
+    def test_save_json_error(self):
+        """
+        Check against a report that cannot be written
+        """
+        path = os.path.join(self.test_dir, "missing", "profile.json")
+        self.assertFalse(self.profile.save_json(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Test module for template.py
+"""
+
+import unittest
+
+from src.leafnode import LeafNode
+from src.parentnode import ParentNode
+from src.template import Template, rewrite_basepath
+
+
+class TestRewriteBasepath(unittest.TestCase):
+    """
+    This class test rewrite_basepath()
+    """
+
+    def test_default_basepath(self):
+        """
+        Check against the default basepath leaving the HTML untouched
+        """
+        html = '<a href="/x">x</a>'
+        self.assertIs(rewrite_basepath(html, "/"), html)
+
+    def test_href_and_src(self):
+        """
+        Check against root-relative href and src attributes
+        """
+        html = (
+            '<a href="/x">x</a><img src="/i.png">'
+            '<a href="https://e.com">e</a>'
+        )
+        self.assertEqual(
+            rewrite_basepath(html, "/site/"),
+            '<a href="/site/x">x</a><img src="/site/i.png">'
+            '<a href="https://e.com">e</a>',
+        )
+
+
+class TestTemplate(unittest.TestCase):
+    """
+    This class test Template
+    """
+
+    def test_compiled_segments(self):
+        """
+        Check against the literals and slots of a compiled template
+        """
+        template = Template(
+            "<title>{{ Title }}</title><main>{{Content}}</main>")
+        self.assertEqual(template.slots, ["Title", "Content"])
+        self.assertEqual(
+            template.literals, ["<title>", "</title><main>", "</main>"])
+
+    def test_render_strings(self):
+        """
+        Check against rendering string values
+        """
+        template = Template("<h1>{{ Title }}</h1><p>{{ Date }}</p>")
+        self.assertEqual(
+            template.render({"Title": "Hello", "Date": "2024-01-01"}),
+            "<h1>Hello</h1><p>2024-01-01</p>",
+        )
+
+    def test_render_html_node(self):
+        """
+        Check against rendering an HTMLNode value
+        """
+        template = Template("<article>{{ Content }}</article>")
+        node = ParentNode("p", [LeafNode("b", "bold")])
+        self.assertEqual(
+            template.render({"Content": node}),
+            "<article><p><b>bold</b></p></article>",
+        )
+
+    def test_repeated_slot(self):
+        """
+        Check against a slot used twice
+        """
+        template = Template("{{ Title }} - {{ Title }}")
+        self.assertEqual(template.render({"Title": "T"}), "T - T")
+
+    def test_missing_value_kept(self):
+        """
+        Check against a slot without value being rendered unchanged
+        """
+        template = Template("<p>{{ Author }}</p>")
+        self.assertEqual(template.render({}), "<p>{{ Author }}</p>")
+
+    def test_basepath_in_literals(self):
+        """
+        Check against the basepath rewrite of the template itself
+        """
+        template = Template('<link href="/index.css">{{ Content }}', "/site/")
+        self.assertEqual(template.literals[0], '<link href="/site/index.css">')
+
+    def test_basepath_in_values(self):
+        """
+        Check against the basepath rewrite of slot values
+        """
+        template = Template("{{ Content }}", "/site/")
+        node = LeafNode("a", "home", {"href": "/index"})
+        self.assertEqual(
+            template.render({"Content": node}),
+            '<a href="/site/index">home</a>',
+        )
+
+    def test_basepath_in_url_slot(self):
+        """
+        Check against a slot used as the value of a href attribute
+        """
+        template = Template('<a href="{{ Url }}">link</a>', "/site/")
+        self.assertEqual(
+            template.render({"Url": "/blog"}), '<a href="/site/blog">link</a>'
+        )
+        self.assertEqual(
+            template.render({"Url": "https://e.com"}),
+            '<a href="https://e.com">link</a>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,15 @@ Test case class for TextNode class
 
 import unittest
 
-from src.textnode import TextNode, TextType
+from src.textnode import (
+    NORMAL_STYLES,
+    SINGLE_STYLES,
+    STYLE_SETS,
+    TextNode,
+    TextType,
+    add_style,
+    intern_styles,
+)
 
 
 class TestTextNode(unittest.TestCase):
@@ -74,6 +82,62 @@ class TestTextNode(unittest.TestCase):
         # Last line test case with same text/type but different URL
         self.assertNotEqual(node7, node6)
 
+    def test_no_instance_dict(self):
+        """
+        Test that TextNode uses slots
+        """
+        node = TextNode("text", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+        node.content = "new text"
+        node.url = "https://www.babouya.net"
+        self.assertEqual(node.content, "new text")
+        self.assertEqual(node.url, "https://www.babouya.net")
+
+    def test_interned_styles(self):
+        """
+        Test that equal styles share the same frozenset
+        """
+        node1 = TextNode("a", {TextType.BOLD, TextType.ITALIC})
+        node2 = TextNode("b", frozenset((TextType.ITALIC, TextType.BOLD)))
+        node3 = TextNode("c", TextType.BOLD)
+        self.assertIs(node1.styles, node2.styles)
+        self.assertIs(node3.styles, intern_styles({TextType.BOLD}))
+        self.assertEqual(node1.styles, {TextType.BOLD, TextType.ITALIC})
+        self.assertEqual(TextNode("d", None).styles, set())
+
+    def test_style_sets_table(self):
+        """
+        Test that every combination of TextType is interned
+        """
+        self.assertEqual(len(STYLE_SETS), 2 ** len(TextType))
+
+    def test_unknown_styles_kept(self):
+        """
+        Test that styles outside TextType are kept as given
+        """
+        node = TextNode("text", {"test"})
+        self.assertEqual(node.styles, {"test"})
+
+    def test_single_styles(self):
+        """
+        Test that the single style constants are the interned sets
+        """
+        self.assertIs(SINGLE_STYLES[TextType.NORMAL], NORMAL_STYLES)
+        self.assertIs(TextNode("text", TextType.LINK).styles,
+                      SINGLE_STYLES[TextType.LINK])
+
+    def test_add_style(self):
+        """
+        Test that adding a style returns the interned set
+        """
+        styles = add_style(SINGLE_STYLES[TextType.BOLD], TextType.ITALIC)
+        self.assertEqual(styles, {TextType.BOLD, TextType.ITALIC})
+        self.assertIs(styles, intern_styles({TextType.ITALIC, TextType.BOLD}))
+        self.assertIs(add_style(styles, TextType.BOLD), styles)
+        self.assertEqual(
+            add_style(frozenset({"test"}), TextType.BOLD),
+            {"test", TextType.BOLD})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,120 @@
+"""
+Test module for watcher.py
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.watcher import Watcher
+
+
+def _write(path, content):
+    """
+    Write content to the text file at path, moving its modification time
+    forward as polling compares modification times
+    """
+    with open(path, "w", encoding="UTF-8") as f:
+        f.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestWatcher(unittest.TestCase):
+    """
+    This class test Watcher, with inotify when available and with polling
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.test_dir, "content")
+        os.makedirs(os.path.join(self.content_dir, "blog"))
+        self.page_path = os.path.join(self.content_dir, "blog", "post.md")
+        _write(self.page_path, "# Post")
+        self.template_path = os.path.join(self.test_dir, "template.html")
+        _write(self.template_path, "{{ Content }}")
+        self.other_path = os.path.join(self.test_dir, "other.txt")
+
+    def tearDown(self):
+        """
+        Clean up temporary directory
+        """
+        shutil.rmtree(self.test_dir)
+
+    def _watchers(self):
+        """
+        Return a polling watcher and, on Linux, an inotify watcher
+        """
+        paths = [self.content_dir, self.template_path]
+        watchers = [Watcher(paths, interval=0.01,
+                            debounce=0.05, use_inotify=False)]
+        inotify_watcher = Watcher(paths, interval=0.01, debounce=0.05)
+        if inotify_watcher.uses_inotify:
+            watchers.append(inotify_watcher)
+        return watchers
+
+    def test_no_change(self):
+        """
+        Check against a timeout without change
+        """
+        for watcher in self._watchers():
+            with self.subTest(inotify=watcher.uses_inotify):
+                self.assertEqual(watcher.wait_for_changes(timeout=0.05), set())
+                watcher.close()
+
+    def test_modified_created_deleted(self):
+        """
+        Check against a burst of changes reported together
+        """
+        for watcher in self._watchers():
+            with self.subTest(inotify=watcher.uses_inotify):
+                new_path = os.path.join(
+                    self.content_dir, f"new{watcher.uses_inotify}.md")
+                _write(self.page_path, "# Post 2")
+                _write(new_path, "# New")
+                _write(self.template_path, "<p>{{ Content }}</p>")
+                _write(self.other_path, "not watched")
+                changes = watcher.wait_for_changes(timeout=1)
+                self.assertTrue(
+                    {self.page_path, new_path, self.template_path} <= changes)
+                self.assertNotIn(self.other_path, changes)
+
+                os.remove(new_path)
+                self.assertIn(new_path, watcher.wait_for_changes(timeout=1))
+                watcher.close()
+
+    def test_new_directory(self):
+        """
+        Check against a file written in a new directory
+        """
+        for watcher in self._watchers():
+            with self.subTest(inotify=watcher.uses_inotify):
+                new_dir = os.path.join(
+                    self.content_dir, f"section{watcher.uses_inotify}")
+                os.makedirs(new_dir)
+                new_path = os.path.join(new_dir, "index.md")
+                _write(new_path, "# Section")
+                changes = watcher.wait_for_changes(timeout=1)
+                self.assertIn(new_path, changes)
+                watcher.close()
+
+    def test_unwatched_directory(self):
+        """
+        Check against a directory created next to the watched template,
+        which is not watched
+        """
+        for watcher in self._watchers():
+            with self.subTest(inotify=watcher.uses_inotify):
+                other_dir = os.path.join(
+                    self.test_dir, f"other{watcher.uses_inotify}")
+                os.makedirs(os.path.join(other_dir, "sub"))
+                _write(os.path.join(other_dir, "sub", "x.txt"), "not watched")
+                self.assertEqual(watcher.wait_for_changes(timeout=0.2), set())
+                _write(os.path.join(other_dir, "sub", "y.txt"), "not watched")
+                self.assertEqual(watcher.wait_for_changes(timeout=0.2), set())
+                watcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()